@@ -0,0 +1,82 @@
+"""
+`PeCab.pos_batch` against a python loop over `PeCab.pos`.
+
+The batch methods deduplicate their inputs and classify the characters of a
+whole chunk of texts with one table lookup. Parsing takes most of the time on
+both sides, and repeated texts are analyzed once by both, through the cache of
+`pos`, so the difference is small. Every measurement uses a new `PeCab`, so
+neither side starts with a warm cache. The runs of both sides alternate, and the
+best and the median of `REPEATS` runs are reported.
+
+usage: python -m benchmarks.bench_batch
+"""
+import random
+import statistics
+import time
+
+from pecab import PeCab
+
+SENTENCES = [
+    "아버지가방에들어가시다",
+    "이것은 문장입니다.",
+    "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+    "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+    "가벼운 냉장고를 샀어요.",
+    "토끼정에서 크림 우동을 시켰어요.",
+    "오늘 날씨가 정말 좋네요!",
+    "내셔날 에듀 영치기 영차 캘리 콜라비",
+]
+REPEATS = 7
+
+
+def make_texts(size, unique):
+    texts = [f"{SENTENCES[i % len(SENTENCES)]} {i}" for i in range(unique)]
+    if unique == size:
+        return texts
+    return [random.choice(texts) for _ in range(size)]
+
+
+def loop(pecab, texts):
+    return [pecab.pos(text) for text in texts]
+
+
+def batch(pecab, texts):
+    return pecab.pos_batch(texts)
+
+
+def timed(fn, texts):
+    pecab = PeCab()
+    start = time.perf_counter()
+    outputs = fn(pecab, texts)
+    return time.perf_counter() - start, outputs
+
+
+def main():
+    random.seed(0)
+    print(
+        f"{'':<28} {'loop best':>10} {'median':>8} {'batch best':>11} {'median':>8} "
+        f"{'speedup':>8}"
+    )
+    for label, size, unique in [
+        ("2000 texts, all unique", 2000, 2000),
+        ("2000 texts, 500 unique", 2000, 500),
+        ("2000 texts, 50 unique", 2000, 50),
+    ]:
+        texts = make_texts(size, unique)
+        loop_times, batch_times = [], []
+        for _ in range(REPEATS):
+            loop_time, loop_outputs = timed(loop, texts)
+            batch_time, batch_outputs = timed(batch, texts)
+            assert loop_outputs == batch_outputs
+            loop_times.append(loop_time)
+            batch_times.append(batch_time)
+
+        print(
+            f"{label:<28} {min(loop_times):9.3f}s {statistics.median(loop_times):7.3f}s "
+            f"{min(batch_times):10.3f}s {statistics.median(batch_times):7.3f}s "
+            f"{min(loop_times) / min(batch_times):7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Startup with a compiled user dictionary against a list of words.
+
+`PeCab(user_dict=...)` sorts the words and builds their trie and entry table in
+every process. `compile_user_dict` does it once and writes the same arrow files
+as the system dictionary, which `PeCab(user_dict_path=...)` memory maps, so its
+startup does not depend on the size of the lexicon and processes loading the
+same files share their pages. The time of `PeCab()` is included for reference.
+
+usage: python -m benchmarks.bench_compiled_userdict
+"""
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_userdict import make_lexicon
+from pecab import PeCab, compile_user_dict
+
+SIZES = [1000, 100000]
+TEXT = "저는 삼성디지털프라자에서 지펠냉장고를 샀어요."
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    output = fn(*args, **kwargs)
+    return output, (time.perf_counter() - start) * 1e3
+
+
+def main():
+    random.seed(0)
+    _, baseline = timed(PeCab)
+    print(f"{'PeCab()':<28} {baseline:10.1f}ms")
+
+    for size in SIZES:
+        words = make_lexicon(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "user_dict")
+            _, compiled = timed(compile_user_dict, words, path)
+            expected, from_words = timed(PeCab, user_dict=words)
+            pecab, from_path = timed(PeCab, user_dict_path=path)
+            assert pecab.pos(TEXT) == expected.pos(TEXT)
+
+            print(f"{size} words, compiled in {compiled / 1e3:.2f}s")
+            print(f"  {'PeCab(user_dict=words)':<26} {from_words:10.1f}ms")
+            print(f"  {'PeCab(user_dict_path=path)':<26} {from_path:10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Double array trie lookup throughput.
+
+Compares the previous traversal, which read every base/check cell as a boxed
+arrow scalar, against the current one over zero-copy numpy buffers.
+
+usage: python -m benchmarks.bench_datrie
+"""
+import time
+
+from pecab._datrie import DoubleArrayTrie
+from pecab._tokenizer import Tokenizer
+
+TEXT = "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다. 아버지가방에들어가시다"
+REPEAT = 200
+
+
+def arrow_exact_match_search(base, check, key):
+    b = 1
+    for ch in key:
+        p = b + ord(ch) + 1
+        if b == check[p].as_py():
+            b = base[p].as_py()
+        else:
+            return -1
+    n = base[b].as_py()
+    if b == check[b].as_py() and n < 0:
+        return -n - 1
+    return -1
+
+
+def main():
+    arrays = Tokenizer.load_arrow("arrays.arrow")
+    trie = DoubleArrayTrie.from_files(arrays=arrays, words=None)
+    keys = [TEXT[i:j] for i in range(len(TEXT)) for j in range(i + 1, min(i + 8, len(TEXT)) + 1)]
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for key in keys:
+            arrow_exact_match_search(arrays["base"], arrays["check"], key)
+    before = len(keys) * REPEAT / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for key in keys:
+            trie._exact_match_search(key)
+    after = len(keys) * REPEAT / (time.perf_counter() - start)
+
+    print(f"arrow scalars : {before:12,.0f} lookups/s")
+    print(f"numpy buffers : {after:12,.0f} lookups/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Building a double array trie.
+
+`build_arrays` places the trie level by level in numpy arrays, pairing the many
+nodes with a single child with free cells in bulk, and finding free cells for
+the others through links that skip the used ones. It is timed against the
+`DoubleArrayTrie` that shipped before it, kept in `legacy_datrie.py`, which
+placed the children of every node recursively in python lists and scanned the
+cells one by one, on synthetic lexicons of hangul words with shared prefixes.
+
+Times are the best of `REPEATS` builds.
+
+usage: python -m benchmarks.bench_datrie_build
+"""
+import random
+import time
+
+from benchmarks.legacy_datrie import DoubleArrayTrie as LegacyTrie
+from pecab._datrie import DoubleArrayTrie
+
+SIZES = [1000, 10000, 50000, 100000, 1000000]
+REPEATS = 3
+
+
+def make_keys(size):
+    random.seed(0)
+    syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 1000)]
+    stems = ["".join(random.choices(syllables, k=2)) for _ in range(size // 10)]
+    keys = set()
+    while len(keys) < size:
+        tail = random.choices(syllables, k=random.randint(0, 3))
+        keys.add(random.choice(stems) + "".join(tail))
+    return sorted(keys)
+
+
+def timed(fn, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        output = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return output, best
+
+
+def main():
+    for size in SIZES:
+        keys = make_keys(size)
+        data = dict.fromkeys(keys, 0)
+        trie, elapsed = timed(DoubleArrayTrie, data)
+        assert all(trie._exact_match_search(key) == i for i, key in enumerate(keys))
+        print(
+            f"{size:>9,} keys  numpy   : {elapsed:8.3f}s "
+            f"({len(trie._base):,} cells)"
+        )
+
+        legacy, legacy_elapsed = timed(LegacyTrie, data)
+        print(
+            f"{size:>9,} keys  legacy  : {legacy_elapsed:8.3f}s "
+            f"({len(legacy._base):,} cells, {legacy_elapsed / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
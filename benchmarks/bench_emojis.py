@@ -0,0 +1,64 @@
+"""
+Emoji detection.
+
+`get_emoji` used to segment the text into graphemes with `regex` and look every
+character up in the merged `emoji==1.2.0` dictionaries. `find_emojis` walks a
+codepoint trie over the sequences in `_resources/emojis.txt` once, taking the
+longest match, and returns spans. The old implementation is only timed when
+`emoji` and `regex` happen to be installed.
+
+usage: python -m benchmarks.bench_emojis
+"""
+import time
+
+from pecab._utils._emojis import find_emojis, load_emoji_trie
+
+TEXTS = [
+    ("korean, no emoji", "아버지가 방에 들어가신다. 오늘 날씨가 정말 좋네요! " * 20),
+    ("korean + emoji", "가족👨‍👩‍👧 사진 🇰🇷 ❤️ 최고 👍🏽 " * 20),
+    ("emoji only", "😀👨‍👩‍👧🇰🇷❤️1️⃣👍🏽🏳️‍🌈" * 20),
+]
+
+
+def legacy_get_emoji():
+    try:
+        import emoji
+        import regex
+    except ImportError:
+        return None
+
+    emojis = {}
+    for lang in ["pt", "it", "es", "en"]:
+        emojis.update(emoji.unicode_codes.UNICODE_EMOJI[lang])
+    emojis.update({chr(c): "unicode" for c in [0x200D, *range(0xFE00, 0xFE10)]})
+
+    def get_emoji(text):
+        flags = regex.findall("[\U0001F1E6-\U0001F1FF]", text)
+        graphemes = regex.findall(r"\X", text)
+        return [g for g in graphemes if any(c in emojis for c in g)] + flags
+
+    return get_emoji
+
+
+def per_call(fn, text, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    start = time.perf_counter()
+    load_emoji_trie()
+    print(f"trie load: {(time.perf_counter() - start) * 1e3:.1f}ms\n")
+
+    legacy = legacy_get_emoji()
+    print(f"{'':<20} {'chars':>6} {'legacy':>10} {'trie':>10}")
+    for label, text in TEXTS:
+        before = f"{per_call(legacy, text):8.0f}us" if legacy else "       n/a"
+        after = per_call(find_emojis, text)
+        print(f"{label:<20} {len(text):>6} {before} {after:8.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+`PeCab(eojeol_cache_size=...)` against the plain analyzer.
+
+With the eojeol cache, the tokenizer looks up every eojeol that follows a
+settled point of the lattice, keyed on the eojeol, the right id of each node
+it may follow and whether a space comes before it. Analyses from every right id
+are combined instead of parsing the eojeol again. The first occurrences are
+slower because each one is analyzed once per right id, so the cache pays off on
+corpora whose eojeols repeat. The whole-text cache is disabled on both sides.
+
+usage: python -m benchmarks.bench_eojeol
+"""
+import random
+import time
+
+from pecab import PeCab
+
+SENTENCES = [
+    "아버지가방에들어가시다",
+    "이것은 문장입니다.",
+    "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+    "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+    "가벼운 냉장고를 샀어요.",
+    "토끼정에서 크림 우동을 시켰어요.",
+    "오늘 날씨가 정말 좋네요!",
+    "내셔날 에듀 영치기 영차 캘리 콜라비",
+]
+
+
+def make_texts(size):
+    eojeols = " ".join(SENTENCES).split()
+    return [
+        " ".join(random.choice(eojeols) for _ in range(random.randint(1, 12)))
+        for _ in range(size)
+    ]
+
+
+def run(pecab, texts):
+    start = time.perf_counter()
+    outputs = [pecab.pos(text) for text in texts]
+    return time.perf_counter() - start, outputs
+
+
+def main():
+    random.seed(0)
+    texts = make_texts(2000)
+    plain_time, expected = run(PeCab(cache_size=0), texts)
+    print(f"{'plain':<12} {len(texts) / plain_time:8.0f}/s")
+
+    pecab = PeCab(cache_size=0, eojeol_cache_size=None)
+    for label in ["cold cache", "warm cache"]:
+        elapsed, outputs = run(pecab, texts)
+        assert outputs == expected
+        info = pecab.eojeol_cache_info()
+        print(
+            f"{label:<12} {len(texts) / elapsed:8.0f}/s {plain_time / elapsed:6.2f}x "
+            f"hit rate {info.hit_rate:.1%}, {info.entries} entries, "
+            f"{info.bytes / 2 ** 20:.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Cold-start cost of `import pecab`, measured with `python -X importtime`.
+
+The character tables used to be a 44k-line dict literal (plus 5k lines of
+unicode property lists and eager `emoji` / `regex` imports) that were compiled
+and executed on every import. They are now built into `_resources/chars.npy`
+and memory-mapped on first use, so importing pecab costs little more than
+importing numpy and pyarrow.
+
+The budget applies to the time spent in pecab's own modules, which is what this
+repository controls. The script exits with status 1 when the median run is
+over budget.
+
+usage: python -m benchmarks.bench_import
+"""
+import statistics
+import subprocess
+import sys
+
+BUDGET_MS = 50
+RUNS = 7
+
+
+def import_times():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pecab"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def first_call():
+    code = (
+        "import time; from pecab import PeCab; start = time.perf_counter(); "
+        "PeCab().pos('아버지가 방에 들어가신다'); print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(result.stdout) * 1e3
+
+
+def main():
+    runs = [import_times() for _ in range(RUNS)]
+    total = statistics.median(run["pecab"][1] for run in runs) / 1e3
+    own = statistics.median(
+        sum(t for name, (t, _) in run.items() if name.split(".")[0] == "pecab")
+        for run in runs
+    ) / 1e3
+
+    print(f"import pecab (cumulative)  {total:8.1f}ms")
+    print(f"pecab modules (self)       {own:8.1f}ms   budget {BUDGET_MS}ms")
+    for name in ["numpy", "pyarrow"]:
+        if name in runs[0]:
+            median = statistics.median(run[name][1] for run in runs) / 1e3
+            print(f"{name + ' (cumulative)':<26} {median:8.1f}ms")
+
+    print(f"PeCab() and first pos      {first_call():8.1f}ms")
+
+    if own > BUDGET_MS:
+        print("over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Many tenants, each with its own user dictionary.
+
+One `PeCab` per tenant loads the character definition, the dictionaries and
+the tables of unknown words again for every tenant, and keeps a cache per
+tenant. With overlays, a single `PeCab` analyzes the texts of every tenant with
+`pos(text, user_dict=overlay)`, where each overlay is a compiled dictionary
+loaded with `load_user_dict`, and a single cache keyed by the fingerprint of
+the dictionaries. Python allocations are measured with `tracemalloc`, which
+does not count memory-mapped files.
+
+usage: python -m benchmarks.bench_overlay
+"""
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_userdict import make_lexicon
+from pecab import PeCab, compile_user_dict, load_user_dict
+
+TENANTS = 50
+WORDS = 1000
+TEXT = "저는 삼성디지털프라자에서 지펠냉장고를 샀어요."
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    output = fn()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return output, elapsed, size
+
+
+def main():
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for tenant in range(TENANTS):
+            paths.append(os.path.join(tmp, str(tenant)))
+            compile_user_dict(make_lexicon(WORDS), paths[-1])
+
+        def per_tenant():
+            pecabs = [PeCab(user_dict_path=path) for path in paths]
+            return pecabs, [pecab.pos(TEXT) for pecab in pecabs]
+
+        def overlays():
+            pecab = PeCab()
+            user_dicts = [load_user_dict(path) for path in paths]
+            outputs = [pecab.pos(TEXT, user_dict=user_dict) for user_dict in user_dicts]
+            return (pecab, user_dicts), outputs
+
+        (_, expected), elapsed, size = measure(per_tenant)
+        print(f"{TENANTS} tenants, {WORDS} words each")
+        print(f"  {'PeCab per tenant':<20} {elapsed * 1e3:8.1f}ms {size / 1e6:8.1f}MB")
+        (_, outputs), elapsed, size = measure(overlays)
+        assert outputs == expected
+        print(f"  {'overlays':<20} {elapsed * 1e3:8.1f}ms {size / 1e6:8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+`PeCab.pipe` over a process pool against a python loop over `PeCab.pos`.
+
+Workers analyze batches of `batch_size` texts and results are yielded in input
+order. With the `fork` start method the workers inherit the parent's `PeCab`,
+so they use its memory-mapped dictionary and matrix as they are. With `spawn`
+they map the same files again, which shares the page cache.
+
+The speedup depends on the number of cores: on a single core, more processes
+only add overhead.
+
+usage: python -m benchmarks.bench_pipe
+"""
+import os
+import time
+
+from pecab import PeCab
+
+SENTENCES = [
+    "아버지가방에들어가시다",
+    "이것은 문장입니다.",
+    "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+    "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+    "가벼운 냉장고를 샀어요.",
+    "토끼정에서 크림 우동을 시켰어요.",
+    "오늘 날씨가 정말 좋네요!",
+    "내셔날 에듀 영치기 영차 캘리 콜라비",
+]
+
+
+def main():
+    texts = [f"{SENTENCES[i % len(SENTENCES)]} {i}" for i in range(4000)]
+    print(f"{os.cpu_count()} cpu(s), {len(texts)} unique texts\n")
+
+    pecab = PeCab()
+    start = time.perf_counter()
+    expected = [pecab.pos(text) for text in texts]
+    baseline = time.perf_counter() - start
+    print(f"{'loop over pos()':<22} {len(texts) / baseline:8.0f}/s")
+
+    for n_process in sorted({1, 2, 4, os.cpu_count()}):
+        pecab = PeCab()
+        start = time.perf_counter()
+        outputs = list(pecab.pipe(texts, n_process=n_process, batch_size=250))
+        elapsed = time.perf_counter() - start
+        assert outputs == expected
+        print(
+            f"{f'pipe(n_process={n_process})':<22} {len(texts) / elapsed:8.0f}/s "
+            f"{baseline / elapsed:6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Unicode property lookups used by unknown-word grouping.
+
+`is_punctuation` used to scan up to 16 python lists, so its cost depended on
+where (and whether) a character appeared in them. It is now a single table
+lookup. The tokenizer itself no longer calls these predicates: it reads the
+property flags that `CharacterDefinition.normalize` computes for the whole text.
+
+usage: python -m benchmarks.bench_unicode
+"""
+import time
+
+from pecab._utils import _char_definition as d
+from pecab._utils import _char_unicode as u
+
+TABLES = [
+    u.SPACE_SEPARATOR,
+    u.LINE_SEPARATOR,
+    u.PARAGRAPH_SEPARATOR,
+    u.CONTROL,
+    u.FORMAT,
+    u.DASH_PUNCTUATION,
+    u.START_PUNCTUATION,
+    u.END_PUNCTUATION,
+    u.CONNECTOR_PUNCTUATION,
+    u.OTHER_PUNCTUATION,
+    u.MATH_SYMBOL,
+    u.CURRENCY_SYMBOL,
+    u.MODIFIER_SYMBOL,
+    u.OTHER_SYMBOL,
+    u.INITIAL_QUOTE_PUNCTUATION,
+    u.FINAL_QUOTE_PUNCTUATION,
+]
+
+
+def list_is_punctuation(ch):
+    hex_ch = ord(ch)
+    return hex_ch == 0x318D or any(hex_ch in table for table in TABLES)
+
+
+def per_call(fn, ch, repeat=20000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(ch)
+    return (time.perf_counter() - start) / repeat * 1e9
+
+
+def main():
+    print("is_punctuation            lists  bytearray   chars.npy")
+    for label, ch in [
+        ("space (first list)", " "),
+        ("'!' (10th list)", "!"),
+        ("'■' (14th list)", "■"),
+        ("'a' (in no list)", "a"),
+    ]:
+        before = per_call(list_is_punctuation, ch)
+        table = per_call(u.is_punctuation, ch)
+        mmapped = per_call(d.is_punctuation, ch)
+        print(f"{label:<22} {before:8.0f}ns {table:8.0f}ns {mmapped:9.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
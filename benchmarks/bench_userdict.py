@@ -0,0 +1,72 @@
+"""
+User dictionary matching with a large lexicon.
+
+`Tokenizer.parse` used to slice every substring from the current position to
+the end of the text and look it up in a dict, which is quadratic in the length
+of the text. The user dictionary is now compiled into a `DoubleArrayTrie`, and
+the longest match is found with a single prefix walk that stops at the first
+dead end. Both sides are timed on the same lexicon of synthetic product names.
+
+usage: python -m benchmarks.bench_userdict
+"""
+import random
+import time
+
+from pecab import PeCab
+
+SENTENCE = "저는 삼성디지털프라자에서 지펠냉장고를 샀어요. "
+SIZES = [1000, 200000]
+
+
+def make_lexicon(size):
+    syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 400)]
+    words = {"삼성디지털프라자", "지펠냉장고"}
+    while len(words) < size:
+        words.add("".join(random.choices(syllables, k=random.randint(2, 8))))
+    return sorted(words)
+
+
+def legacy_scan(user_dict, text):
+    # the previous lookup: every substring from each position to the end.
+    matches = 0
+    for start in range(len(text)):
+        for end in range(start + 1, len(text) + 1):
+            if user_dict[text[start:end]] is not None:
+                matches += 1
+    return matches
+
+
+def trie_scan(user_dict, text):
+    return sum(
+        user_dict.longest_match(text, start) is not None for start in range(len(text))
+    )
+
+
+def per_call(fn, *args, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    random.seed(0)
+    for size in SIZES:
+        start = time.perf_counter()
+        pecab = PeCab(user_dict=make_lexicon(size))
+        print(f"{size} words, built in {time.perf_counter() - start:.2f}s")
+
+        user_dict = pecab.tokenizer.user_dict
+        for repeat in [1, 10, 40]:
+            text = SENTENCE * repeat
+            legacy = per_call(legacy_scan, user_dict, text)
+            trie = per_call(trie_scan, user_dict, text)
+            analysis = per_call(pecab.tokenizer.tokenize, text)
+            print(
+                f"  {len(text):>5} chars: scan {legacy:8.2f}ms -> {trie:6.2f}ms, "
+                f"pos() {analysis:7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
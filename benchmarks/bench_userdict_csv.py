@@ -0,0 +1,80 @@
+"""
+Reading a mecab-ko-dic csv user dictionary.
+
+`read_csv` parses the file with `pyarrow.csv` and builds the typed entry table
+of the system dictionary with arrow kernels. It is timed against reading the rows
+one by one, with the `csv` module followed by `build_tables`, on a synthetic
+file where every fourth row is a compound with its decomposition.
+Building the trie is not included, see `bench_userdict`.
+
+usage: python -m benchmarks.bench_userdict_csv
+"""
+import csv
+import os
+import random
+import tempfile
+import time
+
+from pecab._entries import CSV_COLUMNS, build_tables, read_csv
+from pecab._utils._consts import Pos
+
+SIZES = [10000, 200000]
+
+
+def write_rows(path, size):
+    syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 400)]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            parts = ["".join(random.choices(syllables, k=2)) for _ in range(2)]
+            surface = "".join(parts)
+            if i % 4 == 0:
+                expression = "+".join(f"{part}/NNG/*" for part in parts)
+                row = [surface, 1780, 3534, 100, "NNG", "*", "T", surface]
+                row += ["Compound", "*", "*", expression]
+            else:
+                row = [surface, 1788, 3549, 100, "NNP", "*", "F", surface]
+                row += ["*", "*", "*", "*"]
+            f.write(",".join(map(str, row)) + "\n")
+
+
+def read_rows(path):
+    types = {"Inflect": Pos.INFLECT, "Compound": Pos.COMPOUND}
+    data = {}
+    with open(path, encoding="utf-8") as f:
+        for row in csv.DictReader(f, fieldnames=CSV_COLUMNS):
+            morphemes = None
+            if row["expression"] != "*":
+                morphemes = [
+                    tuple(morpheme.split("/")[1::-1])
+                    for morpheme in row["expression"].split("+")
+                ]
+            row["POS_type"] = types.get(row["type"], Pos.MORPHEME)
+            row["morphemes"] = morphemes
+            data.setdefault(row["surface"], []).append(row)
+    return build_tables(data)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    output = fn(*args)
+    return output, time.perf_counter() - start
+
+
+def main():
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, f"{size}.csv")
+            write_rows(path, size)
+            expected, rows = timed(read_rows, path)
+            output, vectorized = timed(read_csv, path)
+            assert output[0]["surface"] == expected[0]["surface"]
+            assert output[1].to_pylist() == expected[1].to_pylist()
+            print(
+                f"{size:>7} rows: csv module {rows * 1e3:8.1f}ms, "
+                f"read_csv {vectorized * 1e3:7.1f}ms {rows / vectorized:6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
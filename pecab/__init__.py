@@ -1,5 +1,7 @@
 from pecab._pecab import PeCab
+from pecab._registry import resources
+from pecab._user_dict import UserDictionary, compile_user_dict, load_user_dict
 
-__ALL__ = [PeCab]
+__ALL__ = [PeCab, UserDictionary, compile_user_dict, load_user_dict, resources]
 __version__ = "1.0.8"
 __author__ = "Hyunwoong Ko"
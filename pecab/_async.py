@@ -0,0 +1,119 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from weakref import WeakKeyDictionary
+
+from pecab._pipe import check_arguments
+
+# analyzers of the processes of a `ProcessPoolExecutor`, one per `split_compound`.
+_process_pecabs = {}
+
+
+def _run_in_process(split_compound, user_dict, method, *args):
+    # `user_dict` is the current dictionary of the calling instance. received
+    # dictionaries are kept by fingerprint, so an unchanged one is the same object.
+    pecab = _process_pecabs.get(split_compound)
+    if pecab is None:
+        from pecab._pecab import PeCab
+
+        pecab = _process_pecabs[split_compound] = PeCab(split_compound=split_compound)
+    if pecab.tokenizer.user_dict is not user_dict:
+        pecab.tokenizer.set_user_dict(user_dict)
+    return getattr(pecab, method)(*args)
+
+
+async def _iter_batches(texts, batch_size):
+    batch = []
+    if hasattr(texts, "__aiter__"):
+        async for text in texts:
+            batch.append(text)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    else:
+        for text in texts:
+            batch.append(text)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+    if len(batch) > 0:
+        yield batch
+
+
+class AsyncRunner:
+    def __init__(self, pecab, executor, max_in_flight):
+        if max_in_flight < 1:
+            raise ValueError(
+                f"`max_in_flight` must be positive, but got {max_in_flight}."
+            )
+        self.pecab = pecab
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        # semaphores and futures belong to an event loop, so they are kept per loop.
+        self.loop_states = WeakKeyDictionary()
+
+    def get_loop_state(self, loop):
+        if loop not in self.loop_states:
+            self.loop_states[loop] = (asyncio.Semaphore(self.max_in_flight), {})
+        return self.loop_states[loop]
+
+    async def run(self, method, *args):
+        loop = asyncio.get_running_loop()
+        semaphore, _ = self.get_loop_state(loop)
+
+        if isinstance(self.executor, ProcessPoolExecutor):
+            function = partial(
+                _run_in_process,
+                self.pecab.split_compound,
+                self.pecab.tokenizer.user_dict,
+                method,
+                *args,
+            )
+        else:
+            function = partial(getattr(self.pecab, method), *args)
+
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, function)
+
+    async def analyze(self, method, text, drop_space, user_dict):
+        # identical requests in flight at the same time share one analysis.
+        loop = asyncio.get_running_loop()
+        _, in_flight = self.get_loop_state(loop)
+
+        key = (method, text, drop_space, user_dict)
+        future = in_flight.get(key)
+        if future is None:
+            future = loop.create_task(self.run(method, text, drop_space, user_dict))
+            in_flight[key] = future
+            future.add_done_callback(lambda _: in_flight.pop(key, None))
+
+        # a cancelled caller must not cancel the analysis that others wait for,
+        # and each caller gets its own list.
+        return list(await asyncio.shield(future))
+
+    def pipe(self, texts, method, batch_size, drop_space, user_dict):
+        check_arguments(method, batch_size)
+        return self._pipe(texts, method, batch_size, drop_space, user_dict)
+
+    async def _pipe(self, texts, method, batch_size, drop_space, user_dict):
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        try:
+            async for batch in _iter_batches(texts, batch_size):
+                pending.append(
+                    loop.create_task(
+                        self.run(f"{method}_batch", batch, drop_space, user_dict)
+                    )
+                )
+                if len(pending) >= self.max_in_flight:
+                    for result in await pending.popleft():
+                        yield result
+
+            while len(pending) > 0:
+                for result in await pending.popleft():
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
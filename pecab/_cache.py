@@ -0,0 +1,99 @@
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_entries: Optional[int]
+    max_bytes: Optional[int]
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+def sizeof(obj):
+    # approximate, since strings shared between entries are counted every time.
+    size = sys.getsizeof(obj)
+    if isinstance(obj, tuple):
+        size += sum(sizeof(item) for item in obj)
+    return size
+
+
+class AnalysisCache:
+    # a least recently used cache bounded by the number of entries and, optionally,
+    # by their approximate size in bytes. `None` means no limit.
+    def __init__(
+        self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None
+    ):
+        for name, limit in [("max_entries", max_entries), ("max_bytes", max_bytes)]:
+            if limit is not None and limit < 0:
+                raise ValueError(
+                    f"`{name}` must be non-negative or None, but got {limit}."
+                )
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        self.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, size: Optional[int] = None):
+        if self.max_entries == 0:
+            return
+        if size is None:
+            size = sizeof(key) + sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.bytes += size
+
+            while (
+                self.max_entries is not None and len(self.entries) > self.max_entries
+            ) or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries = OrderedDict()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self):
+        with self.lock:
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self.entries),
+                bytes=self.bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+            )
@@ -0,0 +1,132 @@
+import glob
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from pecab._entries import concat_entries, group_entries, read_csv_rows, read_unk_def
+from pecab._user_dict import build_trie, write_dictionary
+from pecab._utils._arrow import to_array, to_numpy
+from pecab._utils._char_definition import (
+    BLOCK_SIZE,
+    NUM_BLOCKS,
+    category_codes,
+    group_map,
+    invoke_map,
+)
+from pecab._utils._char_unicode import PROPERTY_TABLE
+from pecab._utils._consts import Tokenization
+
+# the files of a mecab-ko-dic directory used by the analyzer, besides the csv
+# files of the entries.
+MATRIX_DEF = "matrix.def"
+UNK_DEF = "unk.def"
+CHAR_DEF = "char.def"
+
+
+def read_entries(paths, max_workers=None):
+    # arrow parses the files without the gil, so that they are read in parallel.
+    with ThreadPoolExecutor(max_workers) as executor:
+        shards = list(executor.map(read_csv_rows, paths))
+    return group_entries(*concat_entries(shards))
+
+
+def read_matrix(path):
+    # the first line is the shape of the matrix, and every other one is the right
+    # id of a word, the left id of the next one and the cost of their connection.
+    with open(path, encoding="utf-8") as f:
+        shape = tuple(int(size) for size in f.readline().split())
+
+    names = ["right_id", "left_id", "cost"]
+    costs = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(skip_rows=1, column_names=names),
+        parse_options=pa_csv.ParseOptions(delimiter=" "),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.int32() for name in names}
+        ),
+    )
+    right_ids, left_ids, cost = [to_numpy(to_array(costs[name])) for name in names]
+    if len(cost) > 0 and (cost.min() < -(1 << 15) or cost.max() >= 1 << 15):
+        raise ValueError(f"Connection costs of {path} do not fit in int16.")
+    if len(cost) > 0 and (right_ids.max() >= shape[0] or left_ids.max() >= shape[1]):
+        raise ValueError(f"Ids of {path} are out of the shape {shape}.")
+
+    matrix = np.zeros(shape, dtype=np.int16)
+    matrix[right_ids, left_ids] = cost
+    return matrix
+
+
+def read_char_def(path):
+    # returns the two-level table of chars.npy, see `load_char_table`.
+    categories = np.zeros(NUM_BLOCKS * BLOCK_SIZE, dtype=np.uint16)
+
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            line = line.split("#")[0].strip()
+            if not line:
+                continue
+
+            fields = line.split()
+            if not fields[0].startswith("0x"):
+                name, invoke, group = fields[0], int(fields[1]), int(fields[2])
+                if (invoke_map.get(name), group_map.get(name)) != (invoke, group):
+                    raise ValueError(
+                        f"The category {name} of {path} differs from the one of "
+                        "the analyzer."
+                    )
+                continue
+
+            first, _, last = fields[0].partition("..")
+            first = int(first, 16)
+            last = int(last, 16) if last else first
+            categories[first : last + 1] = category_codes[fields[1]]
+
+    properties = np.zeros_like(categories)
+    properties[: len(PROPERTY_TABLE)] = np.frombuffer(PROPERTY_TABLE, dtype=np.uint8)
+
+    values = (categories | properties << 8).reshape(NUM_BLOCKS, BLOCK_SIZE)
+    blocks, block_index = np.unique(values, axis=0, return_inverse=True)
+    return np.concatenate([block_index.reshape(-1), blocks.reshape(-1)]).astype(
+        np.uint16
+    )
+
+
+def compile_dictionary(dic_dir, out, max_workers=None):
+    # writes the files of `_resources` for the mecab-ko-dic sources in `dic_dir`.
+    paths = sorted(glob.glob(os.path.join(dic_dir, "*.csv")))
+    if len(paths) == 0:
+        raise ValueError(f"There is no csv file in {dic_dir}.")
+
+    matrix = read_matrix(os.path.join(dic_dir, MATRIX_DEF))
+    if matrix.shape != Tokenization.CONN_SHAPE:
+        raise ValueError(
+            f"The shape of the connection costs must be {Tokenization.CONN_SHAPE}, "
+            f"but got {matrix.shape}."
+        )
+    chars = read_char_def(os.path.join(dic_dir, CHAR_DEF))
+    # checks the file, which is read by the analyzer.
+    read_unk_def(os.path.join(dic_dir, UNK_DEF))
+
+    words, entries = read_entries(paths, max_workers)
+    write_dictionary(
+        out,
+        words,
+        entries,
+        build_trie(words),
+        files=[
+            # matrix.npy holds the raw values, mapped with the shape of `CONN_SHAPE`.
+            ("matrix.npy", lambda f: f.write(matrix.tobytes())),
+            ("chars.npy", partial(np.save, arr=chars)),
+            (UNK_DEF, partial(copy_file, os.path.join(dic_dir, UNK_DEF))),
+        ],
+    )
+
+
+def copy_file(path, f):
+    with open(path, "rb") as source:
+        shutil.copyfileobj(source, f)
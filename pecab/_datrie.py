@@ -1,44 +1,248 @@
 # https://github.com/hyunwoongko/pydatrie
-from typing import List, Any, Dict
-
-
-class _Node:
-    code: int = None
-    depth: int = None
-    left: int = None
-    right: int = None
-
-    def __str__(self):
-        return f"Node(code={self.code}, depth={self.depth}, left={self.left}, right={self.right})"
+from typing import List, Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+from pecab._utils._arrow import to_array, to_buffer
+
+
+# the offsets of the children of a node are tried one by one, up to `MAX_TRIES`
+# times, and then by windows of offsets at once, starting with `WINDOW` offsets.
+# nodes with more than `WIDE_NODE` children only use windows.
+WIDE_NODE = 8
+MAX_TRIES = 16
+WINDOW = 256
+# the offsets of a window are tested by slices until less than 1 / `SPARSE` of
+# them are left, which is counted every `COUNT_EVERY` children.
+COUNT_EVERY = 4
+SPARSE = 16
+
+
+def build_arrays(keys: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    # builds the base and check arrays of sorted unique keys, one depth at a time.
+    # the children of a node are placed at the first offset `begin` where all of
+    # their cells are free, and which is not the offset of another node.
+    # `next_free` links every cell to itself while it is free and past itself once
+    # it is used, and `next_begin` does the same for offsets, so that a search
+    # skips whole runs of used ones, shortening the links on the way. most nodes
+    # have a single child, and those of a depth are placed together.
+    size = 0
+    # no offset below `floor` is tried anymore, and wide nodes are placed from the
+    # offset of the previous one of about the same width.
+    floor = 1
+    wide_floors = [1] * 32
+    base = check = next_free = next_begin = np.zeros(0, dtype=np.int32)
+    used = np.zeros(0, dtype=np.uint8)
+    # scalar accesses go through memoryviews, which are much faster than numpy.
+    base_view = check_view = free_view = begin_view = used_view = memoryview(base)
+
+    def grow(min_size):
+        nonlocal size, base, check, next_free, next_begin, used
+        nonlocal base_view, check_view, free_view, begin_view, used_view
+        new_size = max(size * 2, min_size, 1 << 16)
+        for view in [base_view, check_view, free_view, begin_view, used_view]:
+            view.release()
+        zeros = np.zeros(new_size - size, dtype=np.int32)
+        links = np.arange(size, new_size, dtype=np.int32)
+        base = np.concatenate([base, zeros])
+        check = np.concatenate([check, zeros])
+        next_free = np.concatenate([next_free, links])
+        next_begin = np.concatenate([next_begin, links])
+        used = np.concatenate([used, np.zeros(new_size - size, dtype=np.uint8)])
+        base_view, check_view, free_view, begin_view, used_view = map(
+            memoryview, [base, check, next_free, next_begin, used]
+        )
+        size = new_size
+
+    def find(links, i):
+        # the first free cell or offset from `i`.
+        free = i
+        while links[free] != free:
+            free = links[free]
+        while i != free:
+            links[i], i = free, links[i]
+        return free
+
+    def place(codes):
+        nonlocal floor
+        # the search follows the last child, since the cells of small codes, such
+        # as the end of a key, are mostly free.
+        last_code = codes[-1]
+        cell = floor + last_code
+        if len(codes) <= WIDE_NODE:
+            for _ in range(MAX_TRIES):
+                if cell >= size:
+                    grow(cell + 1)
+                cell = find(free_view, cell)
+                begin = find(begin_view, cell - last_code)
+                if begin + last_code + 1 >= size:
+                    grow(begin + last_code + 2)
+                for code in codes:
+                    if check_view[begin + code] != 0:
+                        break
+                else:
+                    return begin
+                cell = begin + last_code + 1
+            # the free cells left behind are too few to be searched again.
+            floor = begin
+        else:
+            cell = max(cell, wide_floors[len(codes).bit_length()] + last_code)
+
+        if cell >= size:
+            grow(cell + 1)
+        begin = find(begin_view, find(free_view, cell) - last_code)
+        # the window doubles until the children fit, since wide nodes rarely fit
+        # among the cells of the others.
+        codes = codes[::-1]
+        window = WINDOW
+        while True:
+            if begin + window + last_code + 1 >= size:
+                grow(begin + window + last_code + 2)
+            fits = used[begin : begin + window] == 0
+            for child, code in enumerate(codes):
+                fits &= check[begin + code : begin + code + window] == 0
+                if child % COUNT_EVERY == COUNT_EVERY - 1:
+                    if np.count_nonzero(fits) * SPARSE < window:
+                        break
+            begins = np.flatnonzero(fits) + begin
+            for code in codes[child + 1 :]:
+                if len(begins) == 0:
+                    break
+                begins = begins[check[begins + code] == 0]
+            if len(begins) > 0:
+                begin = int(begins[0])
+                if len(codes) > WIDE_NODE:
+                    wide_floors[len(codes).bit_length()] = begin
+                return begin
+            begin = find(begin_view, begin + window)
+            window *= 2
+
+    def place_singles(codes):
+        # the offsets of nodes with a single child. the nodes of a code shared by
+        # only a few of them are placed by `place`, and the others at once, on the
+        # first cells that are free and whose offset is not the one of another node.
+        begins = np.zeros(len(codes), dtype=np.int64)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        bounds = np.flatnonzero(np.diff(sorted_codes, prepend=-1, append=-1))
+        for first, last in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            code = int(sorted_codes[first])
+            if last - first <= WIDE_NODE:
+                for node in order[first:last].tolist():
+                    begin = place([code])
+                    begins[node] = begin
+                    used_view[begin] = 1
+                    begin_view[begin] = begin + 1
+                    check_view[begin + code] = begin
+                    free_view[begin + code] = begin + code + 1
+                continue
 
-    def __repr__(self):
-        return self.__str__()
+            if floor + code + 1 >= size:
+                grow(floor + code + 2)
+            cell = find(begin_view, find(free_view, floor + code) - code) + code
+            window = max(WINDOW, 2 * (last - first))
+            cells = np.zeros(0, dtype=np.int64)
+            while len(cells) < last - first:
+                if cell + window + 1 >= size:
+                    grow(cell + window + 2)
+                fits = check[cell : cell + window] == 0
+                fits &= used[cell - code : cell - code + window] == 0
+                cells = np.concatenate([cells, np.flatnonzero(fits) + cell])
+                cell += window
+                window *= 2
+
+            cells = cells[: last - first]
+            placed = cells - code
+            begins[order[first:last]] = placed
+            used[placed] = 1
+            next_begin[placed] = placed + 1
+            check[cells] = placed
+            next_free[cells] = cells + 1
+        return begins
+
+    # the code of a character is its code point + 1, and 0 ends a key.
+    lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    offsets = np.cumsum(lengths) - lengths
+    chars = np.frombuffer(
+        "".join(keys).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+    ).astype(np.int64)
+
+    # the keys below the nodes of the current depth, in order, the first key of
+    # every node, and the cell of every node. the root is at cell 0.
+    active = np.arange(len(keys))
+    node_start = np.zeros(len(keys), dtype=bool)
+    node_start[:1] = True
+    slots = np.zeros(1, dtype=np.int64)
+    depth = 0
+    end = 1
+
+    while len(active) > 0:
+        code = np.zeros(len(active), dtype=np.int64)
+        has_next = lengths[active] > depth
+        code[has_next] = chars[offsets[active[has_next]] + depth] + 1
+
+        # a child starts with its node, or where the code of the keys changes.
+        child_start = node_start.copy()
+        child_start[1:] |= code[1:] != code[:-1]
+        children = np.flatnonzero(child_start)
+        child_codes = code[children]
+        child_keys = active[children]
+        bounds = np.append(np.flatnonzero(node_start[children]), len(children))
+        child_cells = np.zeros(len(children), dtype=np.int64)
+
+        # the root is at offset 1, where searches start.
+        single = bounds[1:] - bounds[:-1] == 1
+        if depth == 0:
+            single[:] = False
+        if single.any():
+            single_nodes = np.flatnonzero(single)
+            single_codes = child_codes[bounds[single_nodes]]
+            begins = place_singles(single_codes)
+            base[slots[single_nodes]] = begins
+            child_cells[bounds[single_nodes]] = begins + single_codes
+            end = max(end, int(child_cells[bounds[single_nodes]].max()) + 1)
+
+        codes_list = child_codes.tolist()
+        for node in np.flatnonzero(~single).tolist():
+            first, last = int(bounds[node]), int(bounds[node + 1])
+            codes = codes_list[first:last]
+            begin = place(codes)
+            base_view[int(slots[node])] = begin
+            begin_view[begin] = begin + 1
+            used_view[begin] = 1
+            end = max(end, begin + codes[-1] + 1)
+            for child, child_code in enumerate(codes, first):
+                cell = begin + child_code
+                check_view[cell] = begin
+                free_view[cell] = cell + 1
+                child_cells[child] = cell
+
+        # keys that end here are leaves, the others continue below their child.
+        ends = child_codes == 0
+        base[child_cells[ends]] = -child_keys[ends] - 1
+        next_slots = child_cells[~ends]
+
+        # the next depth goes on with the keys that are longer, below their child.
+        active = active[has_next]
+        node_start = child_start[has_next]
+        slots = next_slots
+        depth += 1
+
+    for view in [base_view, check_view, free_view, begin_view, used_view]:
+        view.release()
+    # the unused tail of the arrays is never reached by a search.
+    return base[:end].copy(), check[:end].copy()
 
 
 class DoubleArrayTrie:
-    _unit_size: int = 8
-    _check: List[int]
-    _base: List[int]
-    _used: List[bool]
-
-    _size: int
-    _alloc_size: int
-    _key: List[str]
-    _key_size: int
-    _value: List[int]
+    _check: Sequence[int]
+    _base: Sequence[int]
+    _value: List[Any]
     _value_names: List[str]
-    _progress: int
-    _next_check_pos: int
-    _error: int
 
     def __init__(self, data: Dict[str, Any]):
         self._check = None
         self._base = None
-        self._used = None
-        self._key = None
-        self._size = 0
-        self._alloc_size = 0
-        self._error = 0
         self._value_names = [
             "surface",
             "left_id",
@@ -55,153 +259,13 @@ class DoubleArrayTrie:
         else:
             raise ValueError("constructor param `data` is not a dictionary.")
 
-        del self._used
-        del self._key
-
-    def _build(self, dictionary: Dict[str, Any]) -> int:
-        dictionary = dict(sorted(dictionary.items(), key=lambda x: x[0]))
-        self._value: List[Any] = list(dictionary.values())
-        self._key: List[str] = list(dictionary.keys())
-        self._key_size = len(self._key)
-        self._progress = 0
-
-        self._resize(65536 * 32)
-        self._base[0] = 1
-        self._next_check_pos = 0
-
-        root_node = _Node()
-        root_node.left = 0
-        root_node.right = self._key_size
-        root_node.depth = 0
-
-        siblings: List[_Node] = []
-        self._fetch(root_node, siblings)
-        self._insert(siblings)
-        return self._error
-
-    def _resize(self, new_size: int) -> int:
-        new_base: List[int] = [0] * new_size
-        new_check: List[int] = [0] * new_size
-        new_used: List[bool] = [False] * new_size
-
-        if self._alloc_size > 0:
-            new_base[: self._alloc_size] = self._base[: self._alloc_size]
-            new_check[: self._alloc_size] = self._check[: self._alloc_size]
-            new_used[: self._alloc_size] = self._used[: self._alloc_size]
-
-        self._base = new_base
-        self._check = new_check
-        self._used = new_used
-        self._alloc_size = new_size
-        return self._alloc_size
-
-    def _fetch(self, parent: _Node, siblings: List[_Node]) -> int:
-        if self._error < 0:
-            return 0
-
-        prev = 0
-        for i in range(parent.left, parent.right):
-            if len(self._key[i]) < parent.depth:
-                continue
-
-            tmp: str = self._key[i]
-            cur: int = 0
-
-            if len(tmp) != parent.depth:
-                cur = ord(tmp[parent.depth]) + 1
-
-            if prev > cur:
-                self._error = -3
-                return 0
-
-            if cur != prev or len(siblings) == 0:
-                tmp_node = _Node()
-                tmp_node.depth = parent.depth + 1
-                tmp_node.code = cur
-                tmp_node.left = i
-
-                if len(siblings) != 0:
-                    siblings[len(siblings) - 1].right = i
-
-                siblings.append(tmp_node)
-
-            prev = cur
-
-        if len(siblings) != 0:
-            siblings[len(siblings) - 1].right = parent.right
-
-        return len(siblings)
-
-    def _insert(self, siblings: List[_Node]) -> int:
-        if self._error < 0:
-            return 0
-
-        begin: int = 0
-        pos = max(siblings[0].code + 1, self._next_check_pos) - 1
-        nonzero_num = 0
-        first = 0
-
-        if self._alloc_size <= pos:
-            self._resize(pos + 1)
-
-        while True:
-            pos += 1
-
-            if self._alloc_size <= pos:
-                self._resize(pos + 1)
-
-            if self._check[pos] not in [0, None]:
-                nonzero_num += 1
-                continue
-
-            elif first == 0:
-                self._next_check_pos = pos
-                first = 1
-
-            begin = pos - siblings[0].code
-            if self._alloc_size <= (begin + siblings[len(siblings) - 1].code):
-                l: float = (
-                    1.05
-                    if (1.05 > 1.0 * self._key_size / (self._progress + 1))
-                    else 1.0 * self._key_size / (self._progress + 1)
-                )
-                self._resize(int(self._alloc_size * l))
-
-            if self._used[begin]:
-                continue
-
-            outer_continue = False
-            for i in range(1, len(siblings)):
-                if self._check[begin + siblings[i].code] != 0:
-                    outer_continue = True
-                    break
-            if outer_continue:
-                continue
-
-            break
-
-        if 1.0 * nonzero_num / (pos - self._next_check_pos + 1) >= 0.95:
-            self._next_check_pos = pos
-
-        self._used[begin] = True
-        self._size = (
-            self._size
-            if self._size > begin + siblings[len(siblings) - 1].code + 1
-            else begin + siblings[len(siblings) - 1].code + 1
-        )
-
-        for i in range(len(siblings)):
-            self._check[begin + siblings[i].code] = begin
-
-        for i in range(len(siblings)):
-            new_siblings: List[_Node] = []
-            if self._fetch(siblings[i], new_siblings) == 0:
-                self._base[begin + siblings[i].code] = -siblings[i].left - 1
-                self._progress += 1
-            else:
-                h: int = self._insert(new_siblings)
-                self._base[begin + siblings[i].code] = h
-        return begin
+    def _build(self, dictionary: Dict[str, Any]):
+        keys = sorted(dictionary)
+        self._value = [dictionary[key] for key in keys]
+        base, check = build_arrays(keys)
+        # like the arrays of `from_files`, lookups return plain python integers.
+        self._base = memoryview(base)
+        self._check = memoryview(check)
 
     def _exact_match_search(self, key: str):
         _len = len(key)
@@ -211,18 +275,39 @@ class DoubleArrayTrie:
 
         for i in range(_len):
             p = b + ord(key[i]) + 1
-            check = self._check[p].as_py()
+            if p >= len(self._check):
+                return result
+            check = self._check[p]
             if b == check:
-                b = self._base[p].as_py()
+                b = self._base[p]
             else:
                 return result
 
         p = b
-        n = self._base[p].as_py()
-        if b == self._check[p].as_py() and n < 0:
+        n = self._base[p]
+        if b == self._check[p] and n < 0:
             result = -n - 1
         return result
 
+    def common_prefix_search(self, text: str, start: int = 0) -> List[Tuple[int, int]]:
+        # returns (end, idx) for every key equal to text[start:end]
+        results = []
+        size = len(self._base)
+        b: int = 1
+        p: int
+
+        for i in range(start, len(text)):
+            p = b + ord(text[i]) + 1
+            if p >= size or b != self._check[p]:
+                return results
+            b = self._base[p]
+
+            n = self._base[b]
+            if b == self._check[b] and n < 0:
+                results.append((i + 1, -n - 1))
+
+        return results
+
     def _get_value_from_table(self, idx):
         return {value: self._value[value][idx].as_py() for value in self._value_names}
 
@@ -235,7 +320,8 @@ class DoubleArrayTrie:
     @classmethod
     def from_files(cls, arrays, words):
         trie = cls({})
-        trie._base = arrays["base"]
-        trie._check = arrays["check"]
+        trie._base = to_buffer(to_array(arrays["base"]))
+        trie._check = to_buffer(to_array(arrays["check"]))
         trie._value = words
+        trie._value_names = words.column_names
         return trie
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from pecab._cache import CacheInfo
+from pecab._tokens import Analysis
+
+RESOURCES = os.path.join(os.path.dirname(__file__), "_resources")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    key BLOB PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+
+# the number of writes of a process between two checks of the total size.
+EVICTION_INTERVAL = 1000
+# eviction removes the oldest entries until the cache is this full.
+LOW_WATER_MARK = 0.9
+
+
+def fingerprint(*parts):
+    # the resource files are identified by their size and modification time, so
+    # that a rebuilt dictionary does not reuse the analyses of the previous one.
+    resources = []
+    for name in sorted(os.listdir(RESOURCES)):
+        if not name.startswith("_"):
+            stat = os.stat(os.path.join(RESOURCES, name))
+            resources.append((name, stat.st_size, stat.st_mtime_ns))
+    return hashlib.blake2b(
+        json.dumps([resources, *parts], ensure_ascii=False).encode(), digest_size=16
+    ).digest()
+
+
+def encode(analysis):
+    return json.dumps(analysis, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode(value):
+    terms, offsets, pos_length, pos_types, pos_tags, dict_types = json.loads(value)
+    return Analysis(
+        terms=tuple(terms),
+        offsets=tuple(map(tuple, offsets)),
+        pos_length=tuple(pos_length),
+        pos_types=tuple(pos_types),
+        pos_tags=tuple(pos_tags),
+        dict_types=tuple(dict_types),
+    )
+
+
+class DiskCache:
+    # analyses stored in a sqlite database in WAL mode, so that any number of
+    # processes can read and write it at once. entries are keyed by a hash of the
+    # text, of the analyzer's configuration and of the fingerprint of the user
+    # dictionary, and the oldest entries are evicted when the values take more
+    # than `max_bytes`.
+    def __init__(
+        self, path: str, config_fingerprint: bytes, max_bytes: Optional[int] = None
+    ):
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(
+                f"`max_bytes` must be non-negative or None, but got {max_bytes}."
+            )
+
+        self.path = path
+        self.config_fingerprint = config_fingerprint
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+        self.connect()
+
+    def connect(self):
+        # connections can be used neither from other threads nor from processes
+        # forked after they were opened.
+        connection = getattr(self.local, "connection", None)
+        if connection is not None and self.local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(SCHEMA)
+        self.local.connection = connection
+        self.local.pid = os.getpid()
+        return connection
+
+    def make_key(self, text, user_dict_key):
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"),
+            digest_size=16,
+            key=self.config_fingerprint,
+            salt=bytes.fromhex(user_dict_key) if user_dict_key is not None else b"",
+        ).digest()
+
+    def get(self, text, user_dict_key=None):
+        return self.get_many([text], user_dict_key).get(text)
+
+    def get_many(self, texts, user_dict_key=None):
+        keys = {self.make_key(text, user_dict_key): text for text in texts}
+        outputs = {}
+        connection = self.connect()
+        key_list = list(keys)
+        # sqlite limits the number of parameters of a statement.
+        for start in range(0, len(key_list), 500):
+            chunk = key_list[start : start + 500]
+            rows = connection.execute(
+                "SELECT key, value FROM analyses WHERE key IN "
+                f"({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, value in rows:
+                outputs[keys[key]] = decode(value)
+
+        with self.lock:
+            self.hits += len(outputs)
+            self.misses += len(keys) - len(outputs)
+        return outputs
+
+    def put(self, text, analysis, user_dict_key=None):
+        self.put_many([(text, analysis)], user_dict_key)
+
+    def put_many(self, items, user_dict_key=None):
+        if self.max_bytes == 0:
+            return
+        rows = []
+        for text, analysis in items:
+            value = encode(analysis)
+            rows.append((self.make_key(text, user_dict_key), value, len(value)))
+        if len(rows) == 0:
+            return
+
+        connection = self.connect()
+        connection.executemany(
+            "INSERT OR IGNORE INTO analyses (key, value, size) VALUES (?, ?, ?)", rows
+        )
+
+        with self.lock:
+            check = self.writes // EVICTION_INTERVAL
+            self.writes += len(rows)
+            check = check != self.writes // EVICTION_INTERVAL
+        if check:
+            self.evict()
+
+    def evict(self):
+        if self.max_bytes is None:
+            return
+
+        connection = self.connect()
+        total = connection.execute("SELECT TOTAL(size) FROM analyses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # removes the oldest entries, in insertion order, that make up the excess.
+        excess = total - self.max_bytes * LOW_WATER_MARK
+        deleted = connection.execute(
+            "DELETE FROM analyses WHERE rowid <= ("
+            "SELECT rowid FROM ("
+            "SELECT rowid, SUM(size) OVER (ORDER BY rowid) AS cumulative "
+            "FROM analyses) WHERE cumulative >= ? ORDER BY rowid LIMIT 1)",
+            (excess,),
+        ).rowcount
+        with self.lock:
+            self.evictions += deleted
+
+    def clear(self):
+        self.connect().execute("DELETE FROM analyses")
+        with self.lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        entries, size = (
+            self.connect()
+            .execute("SELECT COUNT(*), TOTAL(size) FROM analyses")
+            .fetchone()
+        )
+        with self.lock:
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=entries,
+                bytes=int(size),
+                max_entries=None,
+                max_bytes=self.max_bytes,
+            )
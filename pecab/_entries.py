@@ -0,0 +1,270 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from pecab._utils._arrow import to_array, to_numpy
+from pecab._utils._consts import Pos
+
+ENTRIES_SCHEMA = pa.schema(
+    [
+        ("left_id", pa.int16()),
+        ("right_id", pa.int16()),
+        ("word_cost", pa.int32()),
+        ("POS", pa.dictionary(pa.int16(), pa.string())),
+        ("POS_type", pa.dictionary(pa.int8(), pa.string())),
+        (
+            "morphemes",
+            pa.list_(pa.struct([("pos", pa.string()), ("surface", pa.string())])),
+        ),
+    ]
+)
+
+
+def build_tables(data):
+    # `data` maps every surface to its homographs. rows are laid out in sorted
+    # surface order, which is the value order of a `DoubleArrayTrie`.
+    surfaces, entry_begin, entry_end = [], [], []
+    columns = {name: [] for name in ENTRIES_SCHEMA.names}
+
+    for surface in sorted(data):
+        surfaces.append(surface)
+        entry_begin.append(len(columns["left_id"]))
+        for val in data[surface]:
+            morphemes = val["morphemes"]
+            columns["left_id"].append(int(val["left_id"]))
+            columns["right_id"].append(int(val["right_id"]))
+            columns["word_cost"].append(int(val["word_cost"]))
+            columns["POS"].append(val["POS"])
+            columns["POS_type"].append(val["POS_type"])
+            columns["morphemes"].append(
+                None
+                if morphemes is None
+                else [{"pos": pos, "surface": form} for pos, form in morphemes]
+            )
+        entry_end.append(len(columns["left_id"]))
+
+    words = pa.table(
+        {
+            "surface": pa.array(surfaces, pa.string()),
+            "entry_begin": pa.array(entry_begin, pa.int32()),
+            "entry_end": pa.array(entry_end, pa.int32()),
+        }
+    )
+    entries = pa.table(columns, schema=ENTRIES_SCHEMA)
+    return words, entries
+
+
+# columns of a mecab-ko-dic csv file.
+CSV_COLUMNS = [
+    "surface",
+    "left_id",
+    "right_id",
+    "word_cost",
+    "POS",
+    "semantic_class",
+    "has_coda",
+    "reading",
+    "type",
+    "first_pos",
+    "last_pos",
+    "expression",
+]
+CSV_TYPES = {
+    "Inflect": Pos.INFLECT,
+    "Compound": Pos.COMPOUND,
+    "Preanalysis": Pos.PREANALYSIS,
+}
+
+
+def read_csv(path, defaults=None):
+    # reads a mecab-ko-dic csv file into the tables of `build_tables` with arrow
+    # kernels only, so that large files are never converted to python objects.
+    surface, entries = read_csv_rows(path, defaults)
+    if len(surface) > 0 and (
+        pc.any(pc.match_substring(surface, " ")).as_py()
+        or pc.min(pc.utf8_length(surface)).as_py() == 0
+    ):
+        raise ValueError("Surfaces can not be empty or contain space.")
+    return group_entries(surface, entries)
+
+
+def read_csv_rows(path, defaults=None):
+    # returns the surfaces and the entries of the rows, in file order. empty ids
+    # and costs are taken from `defaults(csv)`, which maps their names to a value
+    # or to an array of values for every row.
+    csv = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(column_names=CSV_COLUMNS),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={
+                **{name: pa.string() for name in CSV_COLUMNS},
+                "left_id": pa.int16(),
+                "right_id": pa.int16(),
+                "word_cost": pa.int32(),
+            },
+            null_values=[""],
+            strings_can_be_null=False,
+        ),
+    )
+    surface = to_array(csv["surface"])
+
+    columns = {}
+    fill_values = defaults(csv) if defaults is not None else {}
+    for name in ["left_id", "right_id", "word_cost"]:
+        column = to_array(csv[name])
+        if column.null_count > 0:
+            if name not in fill_values:
+                raise ValueError(f"`{name}` is missing in some rows of {path}.")
+            column = pc.if_else(
+                pc.is_null(column), pc.cast(fill_values[name], column.type), column
+            )
+        columns[name] = column
+
+    pos = pc.dictionary_encode(to_array(csv["POS"]))
+    columns["POS"] = pa.DictionaryArray.from_arrays(
+        pc.cast(pos.indices, pa.int16()), pos.dictionary
+    )
+
+    type_ids = pc.fill_null(
+        pc.index_in(to_array(csv["type"]), value_set=pa.array(list(CSV_TYPES))),
+        len(CSV_TYPES),
+    )
+    columns["POS_type"] = pa.DictionaryArray.from_arrays(
+        pc.cast(type_ids, pa.int8()),
+        pa.array(list(CSV_TYPES.values()) + [Pos.MORPHEME]),
+    )
+
+    # "가격/NNG/*+경쟁/NNG/*" becomes [{"pos": "NNG", "surface": "가격"}, ...], and
+    # "*" means that the entry is a single morpheme.
+    expression = to_array(csv["expression"])
+    expression = pc.if_else(pc.equal(expression, "*"), None, expression)
+    morphemes = pc.split_pattern(expression, "+")
+    fields = pc.split_pattern(pc.list_flatten(morphemes), "/")
+    columns["morphemes"] = pa.ListArray.from_arrays(
+        morphemes.offsets,
+        pa.StructArray.from_arrays(
+            [pc.list_element(fields, 1), pc.list_element(fields, 0)],
+            names=["pos", "surface"],
+        ),
+        mask=pc.is_null(morphemes),
+    )
+    return surface, pa.table(columns, schema=ENTRIES_SCHEMA)
+
+
+def read_unk_def(path):
+    # unk.def is laid out like a csv file, with the name of a character category
+    # in place of the surface. emojis are analyzed like symbols unless it defines
+    # their category.
+    surface, entries = read_csv_rows(path)
+    if not pc.any(pc.equal(surface, "EMOJI")).as_py():
+        symbol = pc.index(surface, "SYMBOL").as_py()
+        surface = pa.concat_arrays([surface, pa.array(["EMOJI"])])
+        entries = pa.concat_tables([entries, entries.slice(symbol, 1)])
+    return group_entries(surface, entries.combine_chunks())
+
+
+def concat_entries(shards):
+    # joins the (surface, entries) rows of several files, whose POS dictionaries
+    # differ.
+    surface = pa.concat_arrays([surface for surface, _ in shards])
+    entries = pa.concat_tables([entries for _, entries in shards])
+    return surface, entries.unify_dictionaries().combine_chunks()
+
+
+def group_entries(surface, entries):
+    # sorts the entry rows by their surface, keeping the order of homographs, and
+    # returns them with the words table of their runs.
+    order = pc.sort_indices(surface)
+    surface = surface.take(order)
+    entries = entries.take(order)
+
+    is_start = np.ones(len(surface), dtype=bool)
+    if len(surface) > 1:
+        is_start[1:] = pc.not_equal(surface[1:], surface[:-1]).to_numpy(
+            zero_copy_only=False
+        )
+    starts = np.flatnonzero(is_start)
+    words = pa.table(
+        {
+            "surface": surface.take(pa.array(starts, pa.int64())),
+            "entry_begin": pa.array(starts, pa.int32()),
+            "entry_end": pa.array(
+                np.append(starts[1:], len(surface))[: len(starts)], pa.int32()
+            ),
+        }
+    )
+    return words, entries
+
+
+def entry_surfaces(words):
+    # the surface of every entry row.
+    counts = to_numpy(to_array(words["entry_end"])) - to_numpy(
+        to_array(words["entry_begin"])
+    )
+    return to_array(words["surface"]).take(
+        pa.array(np.repeat(np.arange(len(counts)), counts))
+    )
+
+
+def merge_tables(tables, new_tables, remove):
+    # replaces the entries of the words of `new_tables` and drops those of the
+    # surfaces in `remove`.
+    surface = entry_surfaces(tables[0])
+    keep = pc.invert(
+        pc.is_in(
+            surface,
+            value_set=pa.concat_arrays(
+                [to_array(new_tables[0]["surface"]), pa.array(remove, pa.string())]
+            ),
+        )
+    )
+    return group_entries(
+        pa.concat_arrays([surface.filter(keep), entry_surfaces(new_tables[0])]),
+        pa.concat_tables([tables[1].filter(keep), new_tables[1]]).combine_chunks(),
+    )
+
+
+class EntryTable:
+    def __init__(self, words, entries):
+        self.entry_begin = to_numpy(to_array(words["entry_begin"]))
+        self.entry_end = to_numpy(to_array(words["entry_end"]))
+
+        self.left_ids = to_numpy(to_array(entries["left_id"]))
+        self.right_ids = to_numpy(to_array(entries["right_id"]))
+        self.word_costs = to_numpy(to_array(entries["word_cost"]))
+
+        pos = to_array(entries["POS"])
+        self.pos_ids = to_numpy(pos.indices)
+        self.pos_names = pos.dictionary.to_pylist()
+
+        pos_type = to_array(entries["POS_type"])
+        self.pos_type_ids = to_numpy(pos_type.indices)
+        self.pos_type_names = pos_type.dictionary.to_pylist()
+
+        self.morphemes = to_array(entries["morphemes"])
+
+    @classmethod
+    def from_records(cls, data):
+        return cls(*build_tables(data))
+
+    def __len__(self):
+        return len(self.left_ids)
+
+    def get_rows(self, word_idx):
+        return range(self.entry_begin[word_idx], self.entry_end[word_idx])
+
+    def get_entry(self, row):
+        return (
+            int(self.left_ids[row]),
+            int(self.right_ids[row]),
+            int(self.word_costs[row]),
+            self.pos_names[self.pos_ids[row]],
+            self.pos_type_names[self.pos_type_ids[row]],
+        )
+
+    def get_morphemes(self, row):
+        morphemes = self.morphemes[row].as_py()
+        if morphemes is None:
+            return None
+        return [(morpheme["pos"], morpheme["surface"]) for morpheme in morphemes]
@@ -1,63 +1,164 @@
-from functools import lru_cache
-from typing import Optional, List
+import os
+from itertools import chain
+from threading import Lock
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Optional,
+    List,
+    Union,
+)
 
+from pecab._cache import AnalysisCache, CacheInfo
+from pecab._pipe import pipe
 from pecab._postprocessor import Postprocessor
+from pecab._registry import MemoryFootprint, resources
 from pecab._tokenizer import Tokenizer
+from pecab._tokens import TokenAttributes
+from pecab._user_dict import UserDictionary
 from pecab._utils._consts import Type, Tokenization
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 class PeCab:
     def __init__(
-        self, user_dict: Optional[List[str]] = None, split_compound: bool = False
+        self,
+        user_dict: Optional[Union[List[str], str, os.PathLike]] = None,
+        split_compound: bool = False,
+        cache_size: Optional[int] = Tokenization.CACHE_SIZE,
+        cache_bytes: Optional[int] = None,
+        eojeol_cache_size: Optional[int] = 0,
+        eojeol_cache_bytes: Optional[int] = None,
+        disk_cache: Optional[str] = None,
+        disk_cache_bytes: Optional[int] = Tokenization.DISK_CACHE_BYTES,
+        user_dict_path: Optional[str] = None,
     ):
-        self.tokenizer = Tokenizer(user_dict, split_compound)
+        if user_dict is not None and user_dict_path is not None:
+            raise ValueError(
+                "`user_dict` and `user_dict_path` can not be used together."
+            )
+
+        self.user_dict = user_dict
+        self.user_dict_path = user_dict_path
+        self.split_compound = split_compound
+        self.tokenizer = Tokenizer(
+            user_dict,
+            split_compound,
+            eojeol_cache_size,
+            eojeol_cache_bytes,
+            user_dict_path,
+        )
         self.postprocessor = Postprocessor()
+        self.cache = AnalysisCache(cache_size, cache_bytes)
+        self.disk_cache = None
+        if disk_cache is not None:
+            # sqlite is only imported once a disk cache is used.
+            from pecab._disk_cache import DiskCache, fingerprint
 
-    @lru_cache(maxsize=5000)
-    def _tokenize(self, text: str):
-        self.tokenizer.set_input(text)
-        while self.tokenizer.increment_token():
-            pass
+            self.disk_cache = DiskCache(
+                disk_cache, fingerprint(split_compound), disk_cache_bytes
+            )
+        self.async_runner = None
+        self.user_dict_lock = Lock()
+
+    def _tokenize(self, text: str, user_dict: Optional[UserDictionary] = None):
+        # an analysis uses the user dictionary of its start until its end, and its
+        # cache entries are keyed by the fingerprint of that dictionary.
+        lexicon = self.tokenizer.get_lexicon(user_dict)
+        key = (lexicon.key, text)
+        output = self.cache.get(key)
+        if output is None:
+            if self.disk_cache is not None:
+                output = self.disk_cache.get(text, lexicon.key)
+            if output is None:
+                output = self._postprocess(
+                    self.tokenizer.tokenize(text, lexicon), lexicon
+                )
+                if self.disk_cache is not None:
+                    self.disk_cache.put(text, output, lexicon.key)
+            self.cache.put(key, output)
+        return output
+
+    def _tokenize_batch(
+        self, texts: Iterable[str], user_dict: Optional[UserDictionary] = None
+    ):
+        lexicon = self.tokenizer.get_lexicon(user_dict)
+        texts = list(texts)
+        outputs = {}
+        unique_texts = []
+        for text in dict.fromkeys(texts):
+            output = self.cache.get((lexicon.key, text))
+            if output is None:
+                unique_texts.append(text)
+            else:
+                outputs[text] = output
 
-        token_attributes = self.tokenizer.token_attributes
+        if self.disk_cache is not None and len(unique_texts) > 0:
+            found = self.disk_cache.get_many(unique_texts, lexicon.key)
+            for text, output in found.items():
+                outputs[text] = output
+                self.cache.put((lexicon.key, text), output)
+            unique_texts = [text for text in unique_texts if text not in found]
 
+        for start in range(0, len(unique_texts), Tokenization.BATCH_SIZE):
+            chunk = unique_texts[start : start + Tokenization.BATCH_SIZE]
+            normalized = self.tokenizer.character_definition.normalize_batch(chunk)
+            for text, normalized_text in zip(chunk, normalized):
+                outputs[text] = self._postprocess(
+                    self.tokenizer.tokenize_normalized(normalized_text, lexicon),
+                    lexicon,
+                )
+                self.cache.put((lexicon.key, text), outputs[text])
+            if self.disk_cache is not None:
+                self.disk_cache.put_many(
+                    ((text, outputs[text]) for text in chunk), lexicon.key
+                )
+
+        return [outputs[text] for text in texts]
+
+    def _postprocess(self, token_attributes, lexicon=None):
         if (
             len(token_attributes.terms) == 1
             and token_attributes.dict_types[0] == Type.UNKNOWN
             and len(token_attributes.terms[0]) >= Tokenization.MIN_CHAR_LENGTH
         ):
             token_attributes = self.postprocessor.relax_long_unk(
-                token_attributes, self.tokenizer
+                token_attributes, self.tokenizer, lexicon
             )
 
         return token_attributes.get()
 
-    def morphs(self, text: str, drop_space: bool = True):
-        tokenization_output = self._tokenize(text)
+    @staticmethod
+    def _morphs(tokenization_output, drop_space: bool):
         return [
             token
-            for token in tokenization_output["terms"]
+            for token in tokenization_output.terms
             if drop_space is False
             or (drop_space and token not in " \t\n\r\f\v")
         ]
 
-    def pos(self, text: str, drop_space: bool = True):
-        tokenization_output = self._tokenize(text)
+    @staticmethod
+    def _pos(tokenization_output, drop_space: bool):
         return [
             (token, pos)
             for token, pos in zip(
-                tokenization_output["terms"], tokenization_output["pos_tags"]
+                tokenization_output.terms, tokenization_output.pos_tags
             )
             if drop_space is False
             or (drop_space and token not in " \t\n\r\f\v")
         ]
 
-    def nouns(self, text: str, drop_space: bool = True):
-        tokenization_output = self._tokenize(text)
+    @staticmethod
+    def _nouns(tokenization_output, drop_space: bool):
         return [
             token
             for token, pos in zip(
-                tokenization_output["terms"], tokenization_output["pos_tags"]
+                tokenization_output.terms, tokenization_output.pos_tags
             )
             if (
                 drop_space is False
@@ -65,3 +166,218 @@ class PeCab:
             )
             and pos.startswith("N")
         ]
+
+    def cache_info(self) -> CacheInfo:
+        return self.cache.info()
+
+    def clear_cache(self):
+        self.cache.clear()
+        if self.tokenizer.eojeol_cache is not None:
+            self.tokenizer.eojeol_cache.clear()
+
+    def disk_cache_info(self) -> Optional[CacheInfo]:
+        if self.disk_cache is None:
+            return None
+        return self.disk_cache.info()
+
+    def eojeol_cache_info(self) -> Optional[CacheInfo]:
+        if self.tokenizer.eojeol_cache is None:
+            return None
+        return self.tokenizer.eojeol_cache.info()
+
+    def memory_footprint(self) -> MemoryFootprint:
+        # the resources this instance shares with the others of the process, and
+        # the memory that only this instance uses.
+        keys = list(self.tokenizer.resource_keys)
+        user_dict = self.tokenizer.user_dict
+        if user_dict is not None and user_dict.resource_key is not None:
+            keys.append(user_dict.resource_key)
+
+        eojeol_cache = self.tokenizer.eojeol_cache
+        return MemoryFootprint(
+            shared={key: resources.info(key) for key in keys},
+            instance={
+                "cache": self.cache.info().bytes,
+                "eojeol_cache": eojeol_cache.info().bytes
+                if eojeol_cache is not None
+                else 0,
+                "user_dict": user_dict.nbytes if user_dict is not None else 0,
+                "states": self.tokenizer.state_bytes(),
+            },
+        )
+
+    def update_user_dict(
+        self,
+        add: Optional[Union[List[str], str, os.PathLike]] = None,
+        remove: Optional[List[str]] = None,
+    ):
+        # the new dictionary is built by the calling thread while the others keep
+        # analyzing with the current one, and then replaces it at once. cached
+        # analyses of the previous dictionary are no longer hit, and get evicted.
+        # process pools receive the current dictionary rather than the updates.
+        if add is not None and not isinstance(add, (str, os.PathLike)):
+            add = tuple(add)
+        remove = tuple(remove or ())
+        with self.user_dict_lock:
+            self.tokenizer.update_user_dict(add, remove)
+
+    def reload_user_dict(self, path: Union[str, os.PathLike]):
+        # `path` is a directory written by `compile_user_dict`, or a csv file.
+        user_dict, user_dict_path = path, None
+        if os.path.isdir(path):
+            user_dict, user_dict_path = None, path
+        with self.user_dict_lock:
+            self.tokenizer.load_user_dict(user_dict, user_dict_path)
+            self.user_dict = user_dict
+            self.user_dict_path = user_dict_path
+
+    def morphs(
+        self,
+        text: str,
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return self._morphs(self._tokenize(text, user_dict), drop_space)
+
+    def pos(
+        self,
+        text: str,
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return self._pos(self._tokenize(text, user_dict), drop_space)
+
+    def nouns(
+        self,
+        text: str,
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return self._nouns(self._tokenize(text, user_dict), drop_space)
+
+    def morphs_batch(
+        self,
+        texts: Iterable[str],
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return [
+            self._morphs(output, drop_space)
+            for output in self._tokenize_batch(texts, user_dict)
+        ]
+
+    def pos_batch(
+        self,
+        texts: Iterable[str],
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return [
+            self._pos(output, drop_space)
+            for output in self._tokenize_batch(texts, user_dict)
+        ]
+
+    def nouns_batch(
+        self,
+        texts: Iterable[str],
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return [
+            self._nouns(output, drop_space)
+            for output in self._tokenize_batch(texts, user_dict)
+        ]
+
+    def pipe(
+        self,
+        texts: Iterable[str],
+        method: str = "pos",
+        n_process: int = 1,
+        batch_size: int = 1000,
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ) -> Iterator:
+        return pipe(self, texts, method, n_process, batch_size, drop_space, user_dict)
+
+    def iter_pos(
+        self,
+        text_or_file: Union[str, IO[str]],
+        drop_space: bool = True,
+        chunk_size: int = Tokenization.STREAM_CHUNK_SIZE,
+        user_dict: Optional[UserDictionary] = None,
+    ) -> Iterator:
+        lexicon = self.tokenizer.get_lexicon(user_dict)
+        tokens = self.tokenizer.iter_tokens(text_or_file, chunk_size, lexicon)
+        first, second = next(tokens, None), next(tokens, None)
+        if first is None:
+            return
+
+        if second is None:
+            # a single token goes through the same postprocessing as in `pos`.
+            token_attributes = TokenAttributes()
+            token_attributes.append(first)
+            yield from self._pos(
+                self._postprocess(token_attributes, lexicon), drop_space
+            )
+            return
+
+        for token in chain((first, second), tokens):
+            if drop_space is False or token.surface_form not in " \t\n\r\f\v":
+                yield token.surface_form, token.pos_tag
+
+    def set_executor(
+        self,
+        executor: Optional["Executor"] = None,
+        max_in_flight: int = Tokenization.MAX_IN_FLIGHT,
+    ):
+        # asyncio is only imported once the async API is used.
+        from pecab._async import AsyncRunner
+
+        self.async_runner = AsyncRunner(self, executor, max_in_flight)
+
+    def _get_async_runner(self):
+        if self.async_runner is None:
+            self.set_executor()
+        return self.async_runner
+
+    async def amorphs(
+        self,
+        text: str,
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return await self._get_async_runner().analyze(
+            "morphs", text, drop_space, user_dict
+        )
+
+    async def apos(
+        self,
+        text: str,
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return await self._get_async_runner().analyze(
+            "pos", text, drop_space, user_dict
+        )
+
+    async def anouns(
+        self,
+        text: str,
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ):
+        return await self._get_async_runner().analyze(
+            "nouns", text, drop_space, user_dict
+        )
+
+    def apipe(
+        self,
+        texts,
+        method: str = "pos",
+        batch_size: int = 1000,
+        drop_space: bool = True,
+        user_dict: Optional[UserDictionary] = None,
+    ) -> AsyncIterator:
+        return self._get_async_runner().pipe(
+            texts, method, batch_size, drop_space, user_dict
+        )
@@ -0,0 +1,90 @@
+import os
+from collections import deque
+from itertools import islice
+
+METHODS = ["morphs", "pos", "nouns"]
+
+# the analyzer of a worker process. with the `fork` start method it is inherited
+# from the parent, so workers use the parent's memory maps and analysis cache as
+# they are.
+_worker_pecab = None
+
+
+def _init_worker(split_compound, user_dict):
+    # `user_dict` is the current dictionary of the parent, see
+    # `UserDictionary.__reduce__`.
+    global _worker_pecab
+    if _worker_pecab is None:
+        from pecab._pecab import PeCab
+
+        _worker_pecab = PeCab(split_compound=split_compound)
+        _worker_pecab.tokenizer.set_user_dict(user_dict)
+
+
+def _run_batch(method, texts, drop_space, user_dict):
+    # a user dictionary of the call is unpickled once per worker, see
+    # `UserDictionary.__reduce__`.
+    return getattr(_worker_pecab, f"{method}_batch")(texts, drop_space, user_dict)
+
+
+def iter_batches(texts, batch_size):
+    texts = iter(texts)
+    while True:
+        batch = list(islice(texts, batch_size))
+        if len(batch) == 0:
+            return
+        yield batch
+
+
+def check_arguments(method, batch_size):
+    if method not in METHODS:
+        raise ValueError(f"`method` must be one of {METHODS}, but got {method!r}.")
+    if batch_size < 1:
+        raise ValueError(f"`batch_size` must be positive, but got {batch_size}.")
+
+
+def pipe(pecab, texts, method, n_process, batch_size, drop_space, user_dict):
+    check_arguments(method, batch_size)
+    if n_process == -1:
+        n_process = os.cpu_count()
+    if n_process < 1:
+        raise ValueError(f"`n_process` must be positive or -1, but got {n_process}.")
+
+    batches = iter_batches(texts, batch_size)
+    if n_process == 1:
+        return _pipe_in_process(pecab, batches, method, drop_space, user_dict)
+    return _pipe_in_pool(pecab, batches, method, n_process, drop_space, user_dict)
+
+
+def _pipe_in_process(pecab, batches, method, drop_space, user_dict):
+    for batch in batches:
+        yield from getattr(pecab, f"{method}_batch")(batch, drop_space, user_dict)
+
+
+def _pipe_in_pool(pecab, batches, method, n_process, drop_space, user_dict):
+    global _worker_pecab
+    from multiprocessing import get_context
+
+    _worker_pecab = pecab
+    try:
+        pool = get_context().Pool(
+            n_process,
+            initializer=_init_worker,
+            initargs=(pecab.split_compound, pecab.tokenizer.user_dict),
+        )
+    finally:
+        _worker_pecab = None
+
+    with pool:
+        # at most two batches per process are in flight, so that the input is
+        # consumed lazily and the results are yielded in input order.
+        pending = deque()
+        for batch in batches:
+            pending.append(
+                pool.apply_async(_run_batch, (method, batch, drop_space, user_dict))
+            )
+            if len(pending) > 2 * n_process:
+                yield from pending.popleft().get()
+
+        while len(pending) > 0:
+            yield from pending.popleft().get()
@@ -21,7 +21,7 @@ class Postprocessor:
             target.__dict__[name] += source.__dict__[name]
         return target
 
-    def relax_long_unk(self, tkn_attr_obj, tokenizer):
+    def relax_long_unk(self, tkn_attr_obj, tokenizer, lexicon=None):
         long_unknown_token = tkn_attr_obj.terms[0]
         idx = -1
         for i, ch in enumerate(long_unknown_token):
@@ -40,8 +40,5 @@ class Postprocessor:
             terms=front_string, offsets=(0, len(front_string) - 1)
         )
 
-        tokenizer.set_input(rest_string)
-        while tokenizer.increment_token():
-            pass
-        rest_tkn_attr = tokenizer.tkn_attr_obj
+        rest_tkn_attr = tokenizer.tokenize(rest_string, lexicon)
         return self._merge_token_attribute(source=rest_tkn_attr, target=front_tkn_attr)
@@ -0,0 +1,76 @@
+import weakref
+from threading import RLock
+from typing import Dict, NamedTuple
+
+
+class ResourceInfo(NamedTuple):
+    refcount: int
+    # bytes allocated by the process, and bytes of memory-mapped files, which are
+    # shared with every other process that maps them.
+    bytes: int
+    mapped_bytes: int
+
+
+class MemoryFootprint(NamedTuple):
+    shared: Dict[str, ResourceInfo]
+    instance: Dict[str, int]
+
+    @property
+    def shared_bytes(self):
+        return sum(info.bytes for info in self.shared.values())
+
+    @property
+    def mapped_bytes(self):
+        return sum(info.mapped_bytes for info in self.shared.values())
+
+    @property
+    def instance_bytes(self):
+        return sum(self.instance.values())
+
+
+class ResourceRegistry:
+    # resources loaded once per process and shared by every analyzer. each one is
+    # counted by the objects using it, and dropped from the registry with the last
+    # of them, so that it is freed once nothing else refers to it.
+    def __init__(self):
+        # loaders may acquire other resources.
+        self.lock = RLock()
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def acquire(self, key, loader, owner):
+        # `loader` returns (resource, bytes, mapped_bytes), and `owner` holds a
+        # reference until it is garbage collected.
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                resource, size, mapped_size = loader()
+                entry = self.entries[key] = [resource, 0, size, mapped_size]
+            entry[1] += 1
+        weakref.finalize(owner, self.release, key)
+        return entry[0]
+
+    def release(self, key):
+        with self.lock:
+            entry = self.entries[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.entries[key]
+
+    def info(self, key=None):
+        with self.lock:
+            if key is not None:
+                _, refcount, size, mapped_size = self.entries[key]
+                return ResourceInfo(refcount, size, mapped_size)
+            return {
+                key: ResourceInfo(refcount, size, mapped_size)
+                for key, (_, refcount, size, mapped_size) in self.entries.items()
+            }
+
+
+resources = ResourceRegistry()
@@ -1,145 +1,415 @@
-import ast
 import os
+import re
 import sys
-from functools import lru_cache
+from functools import partial
 from typing import List, Optional
 
 import numpy as np
-import pyarrow as pa
+import pyarrow.compute as pc
 import unicodedata
 
+from pecab._cache import AnalysisCache, sizeof
 from pecab._datrie import DoubleArrayTrie
-from pecab._utils._unknown import UNK
-from pecab._tokens import DictionaryToken, TokenAttributes, DecompoundToken
+from pecab._entries import EntryTable, read_unk_def
+from pecab._registry import resources
+from pecab._utils._arrow import read_table
+from pecab._tokens import DictionaryToken, TokenAttributes, DecompoundToken, Token
 from pecab._user_dict import UserDictionary
-from pecab._utils._char_definition import CharacterDefinition, character_category_map
-from pecab._utils._char_unicode import SPACE_SEPARATOR, NON_SPACING_MARK, is_punctuation
-from pecab._utils._consts import Pos, Tokenization, Type
+from pecab._utils._char_definition import CharacterDefinition, load_char_table
+from pecab._utils._consts import CharProperty, Pos, Tokenization, Type
+
+# the last whitespace of a text.
+LAST_SPACE = re.compile(r"\s(?=\S*\Z)")
 
 PATH = os.path.dirname(__file__)
 
 
 class Tokenizer:
-    def __init__(self, user_dict: Optional[List[str]], split_compound: bool):
-        self.buffer = Tokenizer.Buffer()
+    DICT_TYPES = [Type.KNOWN, Type.UNKNOWN, Type.USER]
+    KNOWN, UNKNOWN, USER = range(len(DICT_TYPES))
+    # nodes restored from the eojeol cache, see `lookup_eojeol`.
+    MEMO = len(DICT_TYPES)
+
+    def __init__(
+        self,
+        user_dict: Optional[List[str]],
+        split_compound: bool,
+        eojeol_cache_size: Optional[int] = 0,
+        eojeol_cache_bytes: Optional[int] = None,
+        user_dict_path: Optional[str] = None,
+    ):
         self.split_compound = split_compound
-        self.character_definition = CharacterDefinition()
-        self.known_dict = DoubleArrayTrie.from_files(
-            arrays=self.load_arrow("arrays.arrow"),
-            words=self.load_arrow("words.arrow"),
+        # everything loaded from `_resources` is shared by the tokenizers of the
+        # process through the registry, and released when this one is collected.
+        self.resource_keys = []
+        self.character_definition = self.acquire(
+            "character_definition", self.load_character_definition
+        )
+        arrays, words, entries = [
+            self.acquire(filename, partial(self.load_mapped_arrow, filename))
+            for filename in ["arrays.arrow", "words.arrow", "entries.arrow"]
+        ]
+        self.known_dict = self.acquire(
+            "known_dict", lambda: (DoubleArrayTrie.from_files(arrays, words), 0, 0)
         )
-        self.conn_costs = np.memmap(
-            os.path.join(PATH, "_resources", "matrix.npy"),
-            mode="r",
-            dtype="int16",
-            shape=Tokenization.CONN_SHAPE,
+        self.known_entries = self.acquire(
+            "known_entries", lambda: (EntryTable(words, entries), 0, 0)
         )
-        self.unknown_dict = UNK
-        self.user_dict = (
-            UserDictionary(self.character_definition, user_dict)
-            if user_dict is not None
-            else None
+        self.known_words = words
+        self.conn_costs = self.acquire("matrix.npy", self.load_matrix)
+        self.unknown_entries, self.unknown_word_ids = self.acquire(
+            "unknown_entries", self.load_unknown_entries
         )
-        self.reset_state()
+        self.space_pos = self.unknown_entries.get_entry(
+            self.unknown_entries.get_rows(self.unknown_word_ids["SPACE"])[0]
+        )[3]
+        self.space_penalties = self.acquire(
+            "space_penalties", self.load_space_penalties
+        )
+        self.load_user_dict(user_dict, user_dict_path)
+        self.states = []
+        self.eojeol_cache = None
+        if eojeol_cache_size != 0:
+            self.eojeol_cache = AnalysisCache(eojeol_cache_size, eojeol_cache_bytes)
+            self.space_prefixes = self.acquire(
+                "space_prefixes", self.load_space_prefixes
+            )
+
+    @property
+    def user_dict(self):
+        return self.lexicon.user_dict
+
+    def load_user_dict(self, user_dict, user_dict_path=None):
+        if user_dict is not None:
+            user_dict = UserDictionary.build(self.character_definition, user_dict)
+        elif user_dict_path is not None:
+            user_dict = UserDictionary.from_path(user_dict_path)
+        self.set_user_dict(user_dict)
+
+    def update_user_dict(self, add, remove):
+        user_dict = self.user_dict
+        if user_dict is None:
+            user_dict = UserDictionary.build(self.character_definition, [])
+        self.set_user_dict(user_dict.update(self.character_definition, add, remove))
+
+    def set_user_dict(self, user_dict):
+        # analyses in progress keep the lexicon they started with, see `State`.
+        self.lexicon = self.Lexicon(self, user_dict)
+
+    def get_lexicon(self, user_dict=None):
+        # the lexicon of a user dictionary given for a single call is built once
+        # per tokenizer, and kept by the dictionary so that it is freed with it.
+        if user_dict is None:
+            return self.lexicon
+        lexicon = user_dict.lexicons.get(self)
+        if lexicon is None:
+            lexicon = user_dict.lexicons[self] = self.Lexicon(self, user_dict)
+        return lexicon
+
+    class Lexicon:
+        # the dictionaries of an analysis. the user dictionary and everything
+        # derived from it are replaced at once, by a single assignment.
+        def __init__(self, tokenizer, user_dict):
+            self.user_dict = user_dict
+            self.key = user_dict.fingerprint if user_dict is not None else None
+            self.dictionaries = [tokenizer.known_entries, tokenizer.unknown_entries]
+            self.space_penalties = list(tokenizer.space_penalties)
+            if user_dict is not None:
+                self.dictionaries.append(user_dict.entries)
+                self.space_penalties.append(
+                    np.array(
+                        [
+                            tokenizer.compute_space_penalty(pos, 1)
+                            for pos in user_dict.entries.pos_names
+                        ]
+                    )
+                )
+
+    def acquire(self, key, loader):
+        self.resource_keys.append(key)
+        return resources.acquire(key, loader, self)
+
+    @staticmethod
+    def load_character_definition():
+        table, _ = load_char_table()
+        return CharacterDefinition(), 0, table.nbytes
+
+    @classmethod
+    def load_mapped_arrow(cls, filename):
+        table = cls.load_arrow(filename)
+        return table, 0, table.nbytes
 
     @staticmethod
-    @lru_cache(maxsize=2)
     def load_arrow(filename):
-        return pa.ipc.RecordBatchFileReader(
-            pa.memory_map(
-                os.path.join(PATH, "_resources", filename),
+        return read_table(os.path.join(PATH, "_resources", filename))
+
+    @staticmethod
+    def load_matrix():
+        conn_costs = np.asarray(
+            np.memmap(
+                os.path.join(PATH, "_resources", "matrix.npy"),
                 mode="r",
+                dtype="int16",
+                shape=Tokenization.CONN_SHAPE,
             )
-        ).read_all()
-
-    @lru_cache(maxsize=5000)
-    def create_entries(self, surface):
-        data_entries = {}
-        word_ref_id = self.known_dict[surface]
-        if word_ref_id is None:
-            return None
-        else:
-            for k, v in word_ref_id.items():
-                for k2, v2 in enumerate(v.split("|")):
-                    if k2 in data_entries:
-                        data_entries[k2][k] = v2
-                    else:
-                        data_entries[k2] = {k: v2}
-            return data_entries
-
-    def reset_state(self):
-        self.pos = 0
-        self.end = False
-        self.last_backtrace_pos = 0
-        self.positions = Tokenizer.WrappedPositionArray()
-        self.token_attributes = TokenAttributes()
-        self.pending = []
-        self.positions.get(0).add(0, 0, -1, -1, -1, -1, Type.KNOWN, None, None, None)
-
-    def set_input(self, text: str):
-        new_text = ""
-        for ch in text:
-            if character_category_map(ch) is None:
-                new_text += " "
+        )
+        return conn_costs, 0, conn_costs.nbytes
+
+    @staticmethod
+    def load_unknown_entries():
+        # the entries of the character categories, by their name.
+        words, entries = read_unk_def(os.path.join(PATH, "_resources", "unk.def"))
+        word_ids = {name: i for i, name in enumerate(words["surface"].to_pylist())}
+        return (
+            (EntryTable(words, entries), word_ids),
+            words.nbytes + entries.nbytes,
+            0,
+        )
+
+    def load_space_penalties(self):
+        space_penalties = [
+            np.array([self.compute_space_penalty(pos, 1) for pos in entries.pos_names])
+            for entries in [self.known_entries, self.unknown_entries]
+        ]
+        return space_penalties, sum(array.nbytes for array in space_penalties), 0
+
+    def load_space_prefixes(self):
+        # a few dictionary words contain spaces, such as "영치기 영차". an eojeol that
+        # ends with the part before the space may be continued by the next eojeol.
+        surfaces = self.known_words["surface"]
+        with_space = pc.filter(surfaces, pc.match_substring(surfaces, " "))
+        space_prefixes = {surface.split(" ")[0] for surface in with_space.to_pylist()}
+        return space_prefixes, sizeof(tuple(space_prefixes)), 0
+
+    def reset_state(self, state):
+        state.pos = 0
+        state.end = False
+        state.last_backtrace_pos = 0
+        state.positions.reset()
+        state.token_attributes = TokenAttributes()
+        state.pending.clear()
+        state.memo_paths = []
+        state.committed_cost = 0
+        state.partial = False
+        state.positions.get(0).add([0], [0], -1, -1, [-1], self.KNOWN, [-1])
+
+    def set_input(self, state, normalized, lexicon):
+        state.buffer.set(*normalized)
+        state.reader = None
+        state.lexicon = lexicon
+        self.reset_state(state)
+
+    def set_reader(self, state, chunks, lexicon):
+        # the text is read from `chunks` while parsing, see `fill`.
+        state.buffer.set("", [], [], {})
+        state.buffer.eof = False
+        state.reader = iter(chunks)
+        state.lexicon = lexicon
+        self.reset_state(state)
+
+    def fill(self, state):
+        # keeps enough text ahead of the current position for every lookup, and
+        # drops the text that has already been emitted.
+        buffer = state.buffer
+        while not buffer.eof and buffer.end < state.pos + Tokenization.STREAM_LOOKAHEAD:
+            chunk = next(state.reader, None)
+            if chunk is None:
+                buffer.eof = True
             else:
-                new_text += ch
+                buffer.trim(state.last_backtrace_pos)
+                buffer.append(*self.character_definition.normalize(chunk))
+
+    @staticmethod
+    def read_chunks(file, chunk_size):
+        # chunks end with a whitespace, so that eojeols and emoji sequences are
+        # never split between chunks. the text after the last one has none, and is
+        # kept until a read brings one.
+        rest = []
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            last_space = LAST_SPACE.search(chunk)
+            if last_space is None:
+                rest.append(chunk)
+                continue
+            cut = last_space.start() + 1
+            yield "".join(rest) + chunk[:cut]
+            rest = [chunk[cut:]]
 
-        self.buffer.set(new_text)
-        self.reset_state()
+        if rest:
+            yield "".join(rest)
+
+    def tokenize(self, text: str, lexicon=None):
+        return self.tokenize_normalized(
+            self.character_definition.normalize(text), lexicon
+        )
+
+    def tokenize_normalized(self, normalized, lexicon=None):
+        # the analysis state is taken from a pool for each call, so that calls from
+        # several threads, or nested calls, never share a lattice.
+        state = self.acquire_state()
+        try:
+            self.set_input(state, normalized, lexicon or self.lexicon)
+            while self.increment_token(state):
+                pass
+            return state.token_attributes
+        finally:
+            self.release_state(state)
+
+    def iter_tokens(self, text_or_file, chunk_size: int, lexicon=None):
+        state = self.acquire_state()
+        try:
+            lexicon = lexicon or self.lexicon
+            if isinstance(text_or_file, str):
+                self.set_input(
+                    state, self.character_definition.normalize(text_or_file), lexicon
+                )
+            else:
+                self.set_reader(
+                    state, self.read_chunks(text_or_file, chunk_size), lexicon
+                )
+
+            token = self.next_token(state)
+            while token is not None:
+                yield token
+                token = self.next_token(state)
+        finally:
+            self.release_state(state)
+
+    def acquire_state(self):
+        try:
+            return self.states.pop()
+        except IndexError:
+            return Tokenizer.State()
+
+    def state_bytes(self):
+        # the lattices of the idle states, which grow to the longest input.
+        return sum(
+            getattr(position, name).nbytes
+            for state in list(self.states)
+            for position in state.positions.positions
+            for name, _ in self.Position.FIELDS
+        )
+
+    def release_state(self, state):
+        # a replaced user dictionary is not kept alive by idle states.
+        state.lexicon = None
+        self.states.append(state)
+
+    class State:
+        def __init__(self):
+            self.buffer = Tokenizer.Buffer()
+            self.positions = Tokenizer.WrappedPositionArray()
+            self.pending = []
+            self.pos = 0
+            self.end = False
+            self.last_backtrace_pos = 0
+            self.token_attributes = TokenAttributes()
+            self.reader = None
+            self.memo_paths = []
+            self.committed_cost = 0
+            self.partial = False
+            # the dictionaries used from the start to the end of the analysis.
+            self.lexicon = None
 
     class Buffer:
-        def set(self, text):
+        # holds the text from absolute position `offset` to `end`. unless the text is
+        # streamed, `offset` is always 0 and the whole text is held.
+        def set(self, text, categories, properties, emojis):
             self.text = text
+            self.categories = categories
+            self.properties = properties
+            self.emojis = emojis
+            self.offset = 0
+            self.end = len(text)
+            self.eof = True
+
+        def append(self, text, categories, properties, emojis):
+            self.emojis.update(
+                {start + self.end: end + self.end for start, end in emojis.items()}
+            )
+            self.text += text
+            self.categories += categories
+            self.properties += properties
+            self.end += len(text)
+
+        def trim(self, pos):
+            cut = pos - self.offset
+            if cut > 0:
+                self.text = self.text[cut:]
+                self.categories = self.categories[cut:]
+                self.properties = self.properties[cut:]
+                self.emojis = {
+                    start: end for start, end in self.emojis.items() if start >= pos
+                }
+                self.offset = pos
+
+        def category(self, pos):
+            return self.categories[pos - self.offset]
+
+        def has_property(self, pos, flag):
+            return (
+                self.offset <= pos < self.end
+                and self.properties[pos - self.offset] & flag != 0
+            )
 
         def get(self, pos):
-            if 0 <= pos <= len(self.text) - 1:
-                return self.text[pos]
+            if self.offset <= pos < self.end:
+                return self.text[pos - self.offset]
             else:
                 return -1
 
         def slice_get(self, start_pos, end_pos):
-            return self.text[start_pos:end_pos]
+            return self.text[start_pos - self.offset : end_pos - self.offset]
 
     class Position:
+        FIELDS = [
+            ("costs", np.int64),
+            ("last_right_id", np.int32),
+            ("back_pos", np.int32),
+            ("back_word_pos", np.int32),
+            ("back_index", np.int32),
+            ("back_dict_type", np.int8),
+            ("back_id", np.int32),
+        ]
+
         def __init__(self):
             self.pos = 0
             self.count = 0
-            self.costs = []
-            self.last_right_id = []
-            self.back_pos = []
-            self.back_word_pos = []
-            self.back_index = []
-            self.back_id = []
-            self.back_dict_type = []
-            self.back_pos_type = []
-            self.morphemes = []
-            self.back_pos_tag = []
+            for name, dtype in self.FIELDS:
+                setattr(self, name, np.zeros(8, dtype=dtype))
+
+        def grow(self, size):
+            size = max(size, 2 * len(self.costs))
+            for name, dtype in self.FIELDS:
+                array = np.zeros(size, dtype=dtype)
+                array[: self.count] = getattr(self, name)[: self.count]
+                setattr(self, name, array)
 
         def add(
             self,
-            cost,
+            costs,
             last_right_id,
             back_pos,
-            back_rpos,
+            back_word_pos,
             back_index,
-            back_id,
             back_dict_type,
-            back_pos_type,
-            morphemes,
-            back_pos_tag,
+            back_id,
         ):
-            self.costs.append(cost)
-            self.last_right_id.append(last_right_id)
-            self.back_pos.append(back_pos)
-            self.back_word_pos.append(back_rpos)
-            self.back_index.append(back_index)
-            self.back_id.append(back_id)
-            self.back_dict_type.append(back_dict_type)
-            self.count += 1
-
-            self.back_pos_type.append(back_pos_type)
-            self.morphemes.append(morphemes)
-            self.back_pos_tag.append(back_pos_tag)
+            start = self.count
+            end = start + len(costs)
+            if end > len(self.costs):
+                self.grow(end)
+
+            self.costs[start:end] = costs
+            self.last_right_id[start:end] = last_right_id
+            self.back_pos[start:end] = back_pos
+            self.back_word_pos[start:end] = back_word_pos
+            self.back_index[start:end] = back_index
+            self.back_dict_type[start:end] = back_dict_type
+            self.back_id[start:end] = back_id
+            self.count = end
 
         def reset(self):
             self.count = 0
@@ -158,15 +428,8 @@ class Tokenizer:
             self.count = 0
 
         def reset(self):
-            self.next_write -= 1
-            while self.count > 0:
-                if self.next_write == -1:
-                    self.next_write = len(self.positions) - 1
-
-                self.positions[self.next_write].reset()
-                self.next_write -= 1
-                self.count -= 1
-
+            # every position that is not alive has already been reset by `free_before`.
+            self.free_before(self.next_pos)
             self.next_write = 0
             self.next_pos = 0
             self.count = 0
@@ -174,19 +437,14 @@ class Tokenizer:
         def get(self, pos):
             while pos >= self.next_pos:
                 if self.count == len(self.positions):
-                    self.new_positions = []
-                    for _ in range(0, 1 + self.count):
-                        self.new_positions.append(Tokenizer.Position())
-
-                    self.new_positions[
-                        : len(self.positions) - self.next_write
-                    ] = self.positions[
-                        self.next_write : len(self.positions) - self.next_write
-                    ]
-                    self.new_positions[
-                        len(self.positions) - self.next_write : self.next_write
-                    ] = self.positions[: self.next_write]
-                    self.positions = self.new_positions[:]
+                    # positions are recycled, so this only happens when more
+                    # positions are alive at once than ever before.
+                    self.positions = (
+                        self.positions[self.next_write :]
+                        + self.positions[: self.next_write]
+                        + [Tokenizer.Position() for _ in range(self.count)]
+                    )
+                    self.next_write = self.count
 
                 if self.next_write == len(self.positions):
                     self.next_write = 0
@@ -216,6 +474,22 @@ class Tokenizer:
                 index += len(self.positions)
             return index
 
+        def free_before(self, pos):
+            to_free = self.count - (self.next_pos - pos)
+            assert 0 <= to_free <= self.count
+
+            index = self.next_write - self.count
+            if index < 0:
+                index += len(self.positions)
+
+            for _ in range(to_free):
+                if index == len(self.positions):
+                    index = 0
+                self.positions[index].reset()
+                index += 1
+
+            self.count -= to_free
+
     @staticmethod
     def compute_space_penalty(left_pos, num_spaces):
         space_penalty = 0
@@ -246,189 +520,199 @@ class Tokenizer:
                 space_penalty = 3000
         return space_penalty
 
-    def add(self, surface, data_dict, from_pos_data, word_pos, end_pos, type_):
-        word_id = surface
-        left_pos = data_dict["POS"]
-        word_cost = int(data_dict["word_cost"])
-        left_id = int(data_dict["left_id"])
-        right_id = int(data_dict["right_id"])
-        back_pos_type = data_dict["POS_type"]
-        morphemes = ast.literal_eval(str(data_dict["morphemes"]))
-
-        least_cost = sys.maxsize
-        least_idx = -1
+    def add(self, state, from_pos_data, word_pos, candidates):
+        # relaxes the entry rows of every (dict_type, begin, end, end_pos) starting
+        # at `word_pos` against all nodes of `from_pos_data` with a single gather.
+        if len(candidates) == 0:
+            return
         assert from_pos_data.count > 0
 
-        for idx in range(0, from_pos_data.count):
-            num_spaces = word_pos - from_pos_data.pos
-            cost = (
-                from_pos_data.costs[idx]
-                + self.conn_costs[from_pos_data.last_right_id[idx], left_id]
-                + self.compute_space_penalty(left_pos, num_spaces)
+        left_ids, word_costs, space_penalties = [], [], []
+        lexicon = state.lexicon
+        for dict_type, begin, end, _ in candidates:
+            entries = lexicon.dictionaries[dict_type]
+            left_ids.append(entries.left_ids[begin:end])
+            word_costs.append(entries.word_costs[begin:end])
+            space_penalties.append(
+                lexicon.space_penalties[dict_type][entries.pos_ids[begin:end]]
             )
+        left_ids = np.concatenate(left_ids)
 
-            if cost < least_cost:
-                least_cost = cost
-                least_idx = idx
-
-        least_cost += word_cost
-        self.positions.get(end_pos).add(
-            cost=least_cost,
-            last_right_id=right_id,
-            back_pos=from_pos_data.pos,
-            back_rpos=word_pos,
-            back_index=least_idx,
-            back_id=word_id,
-            back_dict_type=type_,
-            back_pos_type=back_pos_type,
-            morphemes=morphemes,
-            back_pos_tag=left_pos,
+        count = from_pos_data.count
+        costs = (
+            from_pos_data.costs[:count, None]
+            + self.conn_costs[from_pos_data.last_right_id[:count, None], left_ids]
         )
-
-    def increment_token(self):
-        while len(self.pending) == 0:
-            if self.end:
-                return False
-            self.parse()
-
-        token = self.pending.pop()
-        length = token.length
-        assert length > 0
-        self.token_attributes.terms.append(token.surface_form)
-        self.token_attributes.offsets.append((token.start_offset, token.end_offset))
-        self.token_attributes.pos_length.append(token.pos_len)
-        self.token_attributes.pos_types.append(token.pos_type)
-        self.token_attributes.pos_tags.append(token.pos_tag)
-        self.token_attributes.dict_types.append(token.dict_type)
+        least_idx = costs.argmin(axis=0)
+        least_cost = costs[least_idx, np.arange(len(left_ids))] + np.concatenate(
+            word_costs
+        )
+        if word_pos - from_pos_data.pos > 0:
+            least_cost += np.concatenate(space_penalties)
+
+        offset = 0
+        for dict_type, begin, end, end_pos in candidates:
+            size = end - begin
+            state.positions.get(end_pos).add(
+                costs=least_cost[offset : offset + size],
+                last_right_id=lexicon.dictionaries[dict_type].right_ids[begin:end],
+                back_pos=from_pos_data.pos,
+                back_word_pos=word_pos,
+                back_index=least_idx[offset : offset + size],
+                back_dict_type=dict_type,
+                back_id=np.arange(begin, end),
+            )
+            offset += size
+
+    def next_token(self, state):
+        while len(state.pending) == 0:
+            if state.end:
+                return None
+            self.parse(state)
+        return state.pending.pop()
+
+    def increment_token(self, state):
+        token = self.next_token(state)
+        if token is None:
+            return False
+
+        assert token.length > 0
+        state.token_attributes.append(token)
         return True
 
-    def parse(self):
+    def parse(self, state):
         unknown_word_end_index = -1
         user_word_max_pos_ahead = -1
 
         while True:
-            if self.buffer.get(self.pos) == -1:
+            if state.reader is not None:
+                self.fill(state)
+            if state.buffer.get(state.pos) == -1:
                 break
-            pos_data = self.positions.get(self.pos)
-            is_frontier = self.positions.get_nextpos() == self.pos + 1
+            pos_data = state.positions.get(state.pos)
+            is_frontier = state.positions.get_nextpos() == state.pos + 1
 
             if pos_data.count == 0:
-                self.pos += 1
+                state.pos += 1
                 continue
 
             if (
-                self.pos > self.last_backtrace_pos
+                state.pos > state.last_backtrace_pos
                 and pos_data.count == 1
                 and is_frontier
             ):
-                self.backtrace(pos_data, 0)
+                self.backtrace(state, pos_data, 0)
 
+                state.committed_cost += int(pos_data.costs[0])
                 pos_data.costs[0] = 0
-                if len(self.pending) > 0:
+                if len(state.pending) > 0:
                     return
 
-            if ord(self.buffer.get(self.pos)) in SPACE_SEPARATOR:
-                self.pos += 1
-                next_char = self.buffer.get(self.pos)
+            if state.buffer.has_property(state.pos, CharProperty.SPACE_SEPARATOR):
+                state.pos += 1
 
-                while next_char != -1 and ord(next_char) in SPACE_SEPARATOR:
-                    self.pos += 1
-                    next_char = self.buffer.get(self.pos)
+                while state.buffer.has_property(
+                    state.pos, CharProperty.SPACE_SEPARATOR
+                ):
+                    state.pos += 1
+                    if state.reader is not None:
+                        self.fill(state)
 
-            if self.buffer.get(self.pos) == -1:
-                self.pos = pos_data.pos
+            if state.buffer.get(state.pos) == -1:
+                state.pos = pos_data.pos
 
-            any_matches = False
-            if self.user_dict is not None:
-                max_pos_ahead = 0
-                pos_ahead = self.pos
-
-                while True:
-                    ch = self.buffer.get(pos_ahead)
-                    if ch == -1:
-                        break
-                    surface = self.buffer.slice_get(self.pos, pos_ahead + 1)
-                    user_id_ref = self.user_dict[surface]
-
-                    if user_id_ref is not None:
-                        last_result = user_id_ref
-                        max_pos_ahead = pos_ahead
-                        any_matches = True
+            if (
+                self.eojeol_cache is not None
+                and not state.partial
+                and is_frontier
+                and (state.pos > pos_data.pos or state.pos == 0)
+                and self.lookup_eojeol(state, pos_data)
+            ):
+                continue
 
-                    pos_ahead += 1
+            any_matches = False
+            candidates = []
+            user_dict = state.lexicon.user_dict
+            if user_dict is not None:
+                match = user_dict.longest_match(
+                    state.buffer.text, state.pos - state.buffer.offset
+                )
+                if match is not None:
+                    end_pos, last_result = match
+                    max_pos_ahead = end_pos + state.buffer.offset - 1
+                    any_matches = True
 
                 if any_matches and max_pos_ahead > user_word_max_pos_ahead:
-                    self.add(
-                        last_result["surface"],
-                        last_result,
-                        pos_data,
-                        self.pos,
-                        max_pos_ahead + 1,
-                        Type.USER,
+                    rows = user_dict.entries.get_rows(last_result)
+                    candidates.append(
+                        (self.USER, rows.start, rows.stop, max_pos_ahead + 1)
                     )
                     user_word_max_pos_ahead = max(
                         user_word_max_pos_ahead, max_pos_ahead
                     )
 
             if not any_matches:
-                pos_ahead = self.pos
-                while True:
-                    ch = self.buffer.get(pos_ahead)
-                    if ch == -1:
-                        break
-                    surface = self.buffer.slice_get(self.pos, pos_ahead + 1)
-                    data_entries = self.create_entries(surface)
-
-                    if data_entries is not None:
-                        for data_entry in data_entries.values():
-                            self.add(
-                                surface,
-                                data_entry,
-                                pos_data,
-                                self.pos,
-                                pos_ahead + 1,
-                                Type.KNOWN,
-                            )
-                            any_matches = True
-
-                    pos_ahead += 1
+                for end_pos, word_idx in self.known_dict.common_prefix_search(
+                    state.buffer.text, state.pos - state.buffer.offset
+                ):
+                    rows = self.known_entries.get_rows(word_idx)
+                    candidates.append(
+                        (
+                            self.KNOWN,
+                            rows.start,
+                            rows.stop,
+                            end_pos + state.buffer.offset,
+                        )
+                    )
+                    any_matches = True
 
             if unknown_word_end_index > pos_data.pos:
-                self.pos += 1
+                self.add(state, pos_data, state.pos, candidates)
+                state.pos += 1
                 continue
 
-            first_character = self.buffer.get(self.pos)
-            if any_matches is False or self.character_definition.is_invoke(
-                first_character
-            ):
-                character_id = self.character_definition.get_character_class(
-                    first_character
-                )
-                if self.character_definition.is_group(first_character) is False:
+            first_character = state.buffer.get(state.pos)
+            category = state.buffer.category(state.pos)
+            if any_matches is False or self.character_definition.is_invoke(category):
+                character_id = self.character_definition.get_character_class(category)
+                if state.pos in state.buffer.emojis:
+                    unknown_word_length = state.buffer.emojis[state.pos] - state.pos
+                elif self.character_definition.is_group(category) is False:
                     unknown_word_length = 1
                 else:
                     unknown_word_length = 1
                     script_code = unicodedata.category(first_character)
-                    is_punct = is_punctuation(first_character)
-                    pos_ahead = self.pos + 1
+                    is_punct = state.buffer.has_property(
+                        state.pos, CharProperty.PUNCTUATION
+                    )
+                    pos_ahead = state.pos + 1
 
                     while True:
-                        next_ch = self.buffer.get(pos_ahead)
+                        next_ch = state.buffer.get(pos_ahead)
                         if next_ch == -1:
                             break
-                        next_hex_ch = ord(next_ch)
                         next_script_code = unicodedata.category(next_ch)
 
                         if unknown_word_length == Tokenization.MAX_UNKNOWN_WORD_LENGTH:
                             break
 
+                        if pos_ahead in state.buffer.emojis:
+                            break
+
                         same_script = (script_code == next_script_code) or (
-                            next_hex_ch in NON_SPACING_MARK
+                            state.buffer.has_property(
+                                pos_ahead, CharProperty.NON_SPACING_MARK
+                            )
+                        )
+                        same_punct = is_punct == state.buffer.has_property(
+                            pos_ahead, CharProperty.PUNCTUATION
                         )
                         if (
                             same_script
-                            and is_punct == is_punctuation(next_ch)
-                            and self.character_definition.is_group(next_ch)
+                            and same_punct
+                            and self.character_definition.is_group(
+                                state.buffer.category(pos_ahead)
+                            )
                         ):
                             unknown_word_length += 1
                         else:
@@ -436,78 +720,273 @@ class Tokenizer:
 
                         pos_ahead += 1
 
-                word_id_ref = self.unknown_dict[character_id]
-                self.add(
-                    character_id,
-                    word_id_ref,
-                    pos_data,
-                    self.pos,
-                    self.pos + unknown_word_length,
-                    Type.UNKNOWN,
+                rows = self.unknown_entries.get_rows(
+                    self.unknown_word_ids[character_id]
                 )
+                candidates.append(
+                    (
+                        self.UNKNOWN,
+                        rows.start,
+                        rows.stop,
+                        state.pos + unknown_word_length,
+                    )
+                )
+
+            self.add(state, pos_data, state.pos, candidates)
+            state.pos += 1
+        state.end = True
+
+        if state.pos > 0 and not state.partial:
+            end_pos_data = state.positions.get(state.pos)
+            count = end_pos_data.count
+            costs = (
+                end_pos_data.costs[:count]
+                + self.conn_costs[end_pos_data.last_right_id[:count], 0]
+            )
+            self.backtrace(state, end_pos_data, int(costs.argmin()))
+
+    def lookup_eojeol(self, state, pos_data):
+        # the eojeol starting at `state.pos` only follows the nodes at `pos_data`,
+        # so its analysis only depends on the eojeol, the right id each of these
+        # nodes ends with and whether there is a space in between. the analyses
+        # from every node are cached and combined here, and the nodes at the end
+        # of the eojeol are restored instead of parsing it again.
+        buffer = state.buffer
+        end = state.pos - buffer.offset
+        limit = min(len(buffer.text), end + Tokenization.MAX_EOJEOL_LENGTH + 1)
+        while end < limit and not buffer.properties[end] & CharProperty.SPACE_SEPARATOR:
+            end += 1
+        end += buffer.offset
+        if end - state.pos > Tokenization.MAX_EOJEOL_LENGTH or (
+            end == buffer.end and not buffer.eof
+        ):
+            return False
+
+        eojeol = buffer.slice_get(state.pos, end)
+        if any(eojeol.endswith(prefix) for prefix in self.space_prefixes):
+            return False
+
+        count = pos_data.count
+        spaced = state.pos > pos_data.pos
+        start_ids = pos_data.last_right_id[:count].tolist()
+        right_ids = list(dict.fromkeys(start_ids))
+        inverse = [right_ids.index(right_id) for right_id in start_ids]
+        analyses = [
+            self.get_eojeol_analysis(state, end, right_id, spaced)
+            for right_id in right_ids
+        ]
+        costs = np.stack([costs for costs, _, _ in analyses])[inverse]
+        costs += pos_data.costs[:count, None]
+        least_idx = costs.argmin(axis=0)
+        least_cost = costs[least_idx, np.arange(costs.shape[1])]
+        if ((costs == least_cost).sum(axis=0) > 1).any():
+            # a tie would be broken differently than by parsing the eojeol.
+            return False
+
+        first_id = len(state.memo_paths)
+        state.memo_paths += [
+            analyses[inverse[i]][2][j] for j, i in enumerate(least_idx.tolist())
+        ]
+        state.positions.get(end).add(
+            costs=least_cost,
+            last_right_id=analyses[0][1],
+            back_pos=pos_data.pos,
+            back_word_pos=state.pos,
+            back_index=least_idx,
+            back_dict_type=self.MEMO,
+            back_id=np.arange(first_id, first_id + len(least_idx)),
+        )
+        state.pos = end
+        return True
 
-            self.pos += 1
-        self.end = True
+    def get_eojeol_analysis(self, state, end, right_id, spaced):
+        key = (
+            state.buffer.slice_get(state.pos, end),
+            right_id,
+            spaced,
+            state.lexicon.key,
+        )
+        analysis = self.eojeol_cache.get(key)
+        if analysis is None:
+            analysis = self.analyze_eojeol(
+                state.buffer, state.pos, end, right_id, spaced, state.lexicon
+            )
+            costs, right_ids, paths = analysis
+            # tokens are shared between paths and their tags with the dictionaries,
+            # so only the tokens and their surfaces are counted, once.
+            tokens = {token for path in paths for token in path}
+            size = sizeof(key) + costs.nbytes + right_ids.nbytes
+            size += sum(map(sys.getsizeof, paths))
+            size += sum(sys.getsizeof(token) + sys.getsizeof(token[0]) for token in tokens)
+            self.eojeol_cache.put(key, analysis, size)
+        return analysis
+
+    def analyze_eojeol(self, buffer, start, end, right_id, spaced, lexicon):
+        # parses the eojeol, with the space before it if any, from a single node
+        # with `right_id` and returns the costs, right ids and paths of the nodes
+        # at its end.
+        begin = start - 1 if spaced else start
+        normalized = (
+            buffer.slice_get(begin, end),
+            buffer.categories[begin - buffer.offset : end - buffer.offset],
+            buffer.properties[begin - buffer.offset : end - buffer.offset],
+            {
+                emoji_start - begin: emoji_end - begin
+                for emoji_start, emoji_end in buffer.emojis.items()
+                if begin <= emoji_start < end
+            },
+        )
 
-        if self.pos > 0:
-            end_pos_data = self.positions.get(self.pos)
-            least_cost = sys.maxsize
-            least_idx = -1
+        state = self.acquire_state()
+        try:
+            self.set_input(state, normalized, lexicon)
+            state.positions.get(0).last_right_id[0] = right_id
+            state.partial = True
+
+            tokens = []
+            while not state.end:
+                self.parse(state)
+                tokens += reversed(state.pending)
+                state.pending.clear()
+
+            pos_data = state.positions.get(state.pos)
+            count = pos_data.count
+            prefix = self.relative_tokens(tokens, start - begin)
+            paths = self.trace_paths(state, pos_data, prefix, start - begin)
+            costs = pos_data.costs[:count] + state.committed_cost
+            right_ids = pos_data.last_right_id[:count].copy()
+            costs.flags.writeable = right_ids.flags.writeable = False
+            return costs, right_ids, paths
+        finally:
+            self.release_state(state)
+
+    def trace_paths(self, state, end_pos_data, prefix, start):
+        # the paths of all nodes at `end_pos_data`, which share the tokens of their
+        # common nodes.
+        paths, end_paths = {}, []
+        for i in range(end_pos_data.count):
+            words = []
+            pos, best_idx = end_pos_data.pos, i
+            while pos > state.last_backtrace_pos and (pos, best_idx) not in paths:
+                tokens = []
+                words.append(((pos, best_idx), tokens))
+                pos, best_idx = self.trace_word(state, pos, best_idx, tokens)
+
+            path = paths.get((pos, best_idx), prefix)
+            for node, tokens in reversed(words):
+                path += self.relative_tokens(reversed(tokens), start)
+                paths[node] = path
+            end_paths.append(path)
+
+        return tuple(end_paths)
 
-            for idx in range(0, end_pos_data.count):
-                cost = (
-                    end_pos_data.costs[idx]
-                    + self.conn_costs[end_pos_data.last_right_id[idx], 0]
-                )
+    @staticmethod
+    def relative_tokens(tokens, start):
+        # the space before the eojeol is left out, it is emitted with the first word.
+        return tuple(
+            (
+                token.surface_form,
+                token.length,
+                token.start_offset - start,
+                token.end_offset - start,
+                token.pos_type,
+                token.pos_tag,
+                token.dict_type,
+            )
+            for token in tokens
+            if token.start_offset >= start
+        )
 
-                if cost < least_cost:
-                    least_cost = cost
-                    least_idx = idx
+    def backtrace(self, state, end_pos_data, from_idx):
+        tokens = self.trace(state, end_pos_data, from_idx)
+        state.pending.extend(tokens)
 
-            self.backtrace(end_pos_data, least_idx)
+        state.last_backtrace_pos = end_pos_data.pos
+        state.positions.free_before(end_pos_data.pos)
+        state.memo_paths = []
+
+    @staticmethod
+    def memo_tokens(path, word_pos, offset):
+        tokens = []
+        for surface_form, length, start, end, pos_type, pos_tag, dict_type in path:
+            tokens.append(
+                Token(
+                    surface_form=surface_form,
+                    offset=offset + start,
+                    length=length,
+                    start_offset=word_pos + start,
+                    end_offset=word_pos + end,
+                    pos_type=pos_type,
+                    morphemes=None,
+                    pos_tag=pos_tag,
+                    dict_type=dict_type,
+                )
+            )
+        return tokens[::-1]
 
-    def backtrace(self, end_pos_data, from_idx):
-        end_pos = end_pos_data.pos
-        pos = end_pos
+    def trace(self, state, end_pos_data, from_idx):
+        # returns the tokens of the best path to `end_pos_data` since the last
+        # backtrace, from the last token to the first one.
+        tokens = []
+        pos = end_pos_data.pos
         best_idx = from_idx
 
-        while pos > self.last_backtrace_pos:
-            pos_data = self.positions.get(pos)
-            assert best_idx < pos_data.count
+        while pos > state.last_backtrace_pos:
+            pos, best_idx = self.trace_word(state, pos, best_idx, tokens)
+        return tokens
 
-            back_pos = pos_data.back_pos[best_idx]
-            back_word_pos = pos_data.back_word_pos[best_idx]
-            assert back_pos >= self.last_backtrace_pos
+    def trace_word(self, state, pos, best_idx, tokens):
+        # appends the tokens of the word that the node ends with, and returns the
+        # node before it.
+        pos_data = state.positions.get(pos)
+        assert best_idx < pos_data.count
 
-            length = pos - back_word_pos
-            back_dict_type = pos_data.back_dict_type[best_idx]
-            next_best_idx = pos_data.back_index[best_idx]
+        back_pos = int(pos_data.back_pos[best_idx])
+        back_word_pos = int(pos_data.back_word_pos[best_idx])
+        assert back_pos >= state.last_backtrace_pos
 
-            fragment = self.buffer.slice_get(back_word_pos, back_word_pos + length)
-            back_pos_type = pos_data.back_pos_type[best_idx]
-            morphemes = pos_data.morphemes[best_idx]
-            back_pos_tag = pos_data.back_pos_tag[best_idx]
+        length = pos - back_word_pos
+        next_best_idx = int(pos_data.back_index[best_idx])
+        back_id = int(pos_data.back_id[best_idx])
 
-            fragment_offset = back_word_pos - self.last_backtrace_pos
-            assert fragment_offset >= 0
+        fragment_offset = back_word_pos - state.last_backtrace_pos
+        assert fragment_offset >= 0
+
+        if pos_data.back_dict_type[best_idx] == self.MEMO:
+            tokens += self.memo_tokens(
+                state.memo_paths[back_id], back_word_pos, fragment_offset
+            )
+        else:
+            entries = state.lexicon.dictionaries[pos_data.back_dict_type[best_idx]]
+            back_dict_type = self.DICT_TYPES[pos_data.back_dict_type[best_idx]]
+            fragment = state.buffer.slice_get(
+                back_word_pos, back_word_pos + length
+            )
+            _, _, _, back_pos_tag, back_pos_type = entries.get_entry(back_id)
 
             if back_dict_type == Type.UNKNOWN:
-                for i in range(length - 1, -1, -1):
-                    char_len = 1
+                # unknown words are emitted per character, except for emoji
+                # sequences.
+                if state.buffer.emojis.get(back_word_pos) == pos:
+                    characters = [(0, length)]
+                else:
+                    characters = [(i, 1) for i in range(length - 1, -1, -1)]
+
+                for i, char_len in characters:
                     token = DictionaryToken(
                         dict_type=Type.UNKNOWN,
                         dictionary=None,
                         word_id=None,
-                        surface_form=fragment[i],
+                        surface_form=fragment[i : i + char_len],
                         offset=fragment_offset + i,
                         length=char_len,
                         start_offset=back_word_pos + i,
                         end_offset=back_word_pos + i + char_len,
                         pos_type=back_pos_type,
-                        morphemes=morphemes,
+                        morphemes=None,
                         pos_tag=back_pos_tag,
                     )
-                    self.pending.append(token)
+                    tokens.append(token)
             else:
                 token = DictionaryToken(
                     dict_type=back_dict_type,
@@ -519,13 +998,15 @@ class Tokenizer:
                     start_offset=back_word_pos,
                     end_offset=back_word_pos + length,
                     pos_type=back_pos_type,
-                    morphemes=morphemes,
+                    morphemes=entries.get_morphemes(back_id)
+                    if self.split_compound
+                    else None,
                     pos_tag=back_pos_tag,
                 )
                 if self.split_compound:
                     morphemes = token.morphemes
                     if morphemes is None:
-                        self.pending.append(token)
+                        tokens.append(token)
                     else:
                         _end_offset = back_word_pos + length
                         _pos_length = 0
@@ -554,29 +1035,26 @@ class Tokenizer:
                                 )
                             _pos_length += 1
                             _end_offset -= _len_surface_form
-                            self.pending.append(decompound_token)
+                            tokens.append(decompound_token)
                 else:
-                    self.pending.append(token)
-
-            if back_word_pos != back_pos:
-                offset = back_pos - self.last_backtrace_pos
-                len_ = back_word_pos - back_pos
-                space_token = DictionaryToken(
-                    dict_type=Type.UNKNOWN,
-                    dictionary=None,
-                    word_id=None,
-                    surface_form=" ",
-                    offset=offset,
-                    length=len_,
-                    start_offset=back_pos,
-                    end_offset=back_pos + len_,
-                    pos_type=Pos.MORPHEME,
-                    morphemes=None,
-                    pos_tag=self.unknown_dict["SPACE"]["POS"],
-                )
-                self.pending.append(space_token)
-
-            pos = back_pos
-            best_idx = next_best_idx
+                    tokens.append(token)
+
+        if back_word_pos != back_pos:
+            offset = back_pos - state.last_backtrace_pos
+            len_ = back_word_pos - back_pos
+            space_token = DictionaryToken(
+                dict_type=Type.UNKNOWN,
+                dictionary=None,
+                word_id=None,
+                surface_form=" ",
+                offset=offset,
+                length=len_,
+                start_offset=back_pos,
+                end_offset=back_pos + len_,
+                pos_type=Pos.MORPHEME,
+                morphemes=None,
+                pos_tag=self.space_pos,
+            )
+            tokens.append(space_token)
 
-        self.last_backtrace_pos = end_pos
+        return back_pos, next_best_idx
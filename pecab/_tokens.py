@@ -1,3 +1,6 @@
+from typing import NamedTuple, Tuple
+
+
 class Token(object):
     def __init__(
         self,
@@ -87,5 +90,30 @@ class TokenAttributes(object):
         self.pos_tags = []
         self.dict_types = []
 
+    def append(self, token):
+        self.terms.append(token.surface_form)
+        self.offsets.append((token.start_offset, token.end_offset))
+        self.pos_length.append(token.pos_len)
+        self.pos_types.append(token.pos_type)
+        self.pos_tags.append(token.pos_tag)
+        self.dict_types.append(token.dict_type)
+
     def get(self):
-        return self.__dict__
+        return Analysis(
+            terms=tuple(self.terms),
+            offsets=tuple(self.offsets),
+            pos_length=tuple(self.pos_length),
+            pos_types=tuple(self.pos_types),
+            pos_tags=tuple(self.pos_tags),
+            dict_types=tuple(self.dict_types),
+        )
+
+
+class Analysis(NamedTuple):
+    # the immutable form of `TokenAttributes`, which is safe to cache and share.
+    terms: Tuple[str, ...]
+    offsets: Tuple[Tuple[int, int], ...]
+    pos_length: Tuple[int, ...]
+    pos_types: Tuple[str, ...]
+    pos_tags: Tuple[str, ...]
+    dict_types: Tuple[str, ...]
@@ -1,6 +1,35 @@
-from functools import lru_cache
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from functools import partial
+from threading import Lock
+from weakref import WeakKeyDictionary
 
-from pecab._utils._consts import Pos
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from pecab._datrie import DoubleArrayTrie
+from pecab._entries import EntryTable, build_tables, merge_tables, read_csv
+from pecab._registry import resources
+from pecab._utils._arrow import read_table, write_table
+from pecab._utils._char_definition import CharacterDefinition
+from pecab._utils._consts import Pos, Tokenization
+
+# a compiled user dictionary is a directory laid out like `_resources`.
+ARRAYS_FILE = "arrays.arrow"
+WORDS_FILE = "words.arrow"
+ENTRIES_FILE = "entries.arrow"
+# a dictionary being compiled again may be loaded with files of both versions,
+# which is retried a few times before giving up.
+LOAD_ATTEMPTS = 20
+LOAD_RETRY_DELAY = 0.05
+
+# dictionaries received from other processes, by fingerprint, so that the batches
+# of a `pipe` or the calls of a process pool do not build them again every time.
+_received = OrderedDict()
+_received_lock = Lock()
 
 
 class UserDictionary:
@@ -11,16 +40,57 @@ class UserDictionary:
     RIGHT_ID_F = 3534
     USER_POS = "NNG"
 
-    @lru_cache(maxsize=50)
     def __getitem__(self, item):
-        if item in self.user_token_info:
-            return self.user_token_info[item]
-        else:
+        if self.trie is None:
+            return None
+        word_id = self.trie._exact_match_search(item)
+        return word_id if word_id >= 0 else None
+
+    def longest_match(self, text, start):
+        # returns (end, word_id) of the longest word equal to text[start:end].
+        if self.trie is None:
             return None
+        matches = self.trie.common_prefix_search(text, start)
+        return matches[-1] if len(matches) > 0 else None
+
+    def __init__(self, words, entries, trie):
+        self.tables = (words, entries)
+        self.entries = EntryTable(words=words, entries=entries)
+        # the values of the trie are the indices of the sorted surfaces, which are
+        # also the word indices of `self.entries`.
+        self.trie = trie if words.num_rows > 0 else None
+        self.fingerprint = words.schema.metadata[b"fingerprint"].decode()
+        # lexicons of the tokenizers this dictionary is used with, see
+        # `Tokenizer.get_lexicon`.
+        self.lexicons = WeakKeyDictionary()
+        # the key of its files in the registry and their directory, if it was
+        # loaded from a directory.
+        self.resource_key = None
+        self.path = None
+
+    @classmethod
+    def build(cls, char_definition, user_dict):
+        words, entries = build_user_tables(char_definition, user_dict)
+        return cls(words, entries, build_trie(words))
+
+    def update(self, char_definition, add=None, remove=None):
+        # returns a new dictionary, where the entries of the words of `add` replace
+        # the current ones and the words of `remove` are dropped.
+        remove = sorted(remove or [])
+        new_tables = build_user_tables(char_definition, add or [])
+        words, entries = merge_tables(self.tables, new_tables, remove)
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.fingerprint.encode())
+        digest.update(new_tables[0].schema.metadata[b"fingerprint"])
+        digest.update(fingerprint(remove).encode())
+        words = words.replace_schema_metadata({"fingerprint": digest.hexdigest()})
+        return UserDictionary(words, entries, build_trie(words))
 
-    def __init__(self, char_definition, entries):
+    @classmethod
+    def make_records(cls, char_definition, entries):
         entries = sorted(entries, reverse=True)
-        self.user_token_info = {}
+        user_token_info = {}
 
         for token in entries:
             token = token.strip()
@@ -34,18 +104,192 @@ class UserDictionary:
             last_char = token[-1]
             if char_definition.is_hangul(last_char):
                 if char_definition.has_coda(last_char):
-                    right_id = self.RIGHT_ID_T
+                    right_id = cls.RIGHT_ID_T
                 else:
-                    right_id = self.RIGHT_ID_F
+                    right_id = cls.RIGHT_ID_F
             else:
-                right_id = self.RIGHT_ID
+                right_id = cls.RIGHT_ID
 
             morph_inf = dict()
             morph_inf["surface"] = token
-            morph_inf["left_id"] = self.LEFT_ID
+            morph_inf["left_id"] = cls.LEFT_ID
             morph_inf["right_id"] = right_id
-            morph_inf["word_cost"] = int(self.WORD_COST)
-            morph_inf["POS"] = self.USER_POS
+            morph_inf["word_cost"] = int(cls.WORD_COST)
+            morph_inf["POS"] = cls.USER_POS
             morph_inf["POS_type"] = Pos.MORPHEME
             morph_inf["morphemes"] = None
-            self.user_token_info[token] = morph_inf
+            user_token_info[token] = morph_inf
+
+        return user_token_info
+
+    @classmethod
+    def csv_defaults(cls, csv):
+        # csv rows without ids or cost are registered like the words of a list.
+        has_coda = csv["has_coda"]
+        return {
+            "left_id": cls.LEFT_ID,
+            "right_id": pc.if_else(
+                pc.equal(has_coda, "T"),
+                cls.RIGHT_ID_T,
+                pc.if_else(pc.equal(has_coda, "F"), cls.RIGHT_ID_F, cls.RIGHT_ID),
+            ),
+            "word_cost": cls.WORD_COST,
+        }
+
+    @classmethod
+    def from_path(cls, path):
+        # the files are memory mapped and shared through the registry with every
+        # dictionary loaded from the same files, so nothing is built or copied at
+        # startup and processes that load them share their pages.
+        words_file = os.path.join(path, WORDS_FILE)
+        key = f"{os.path.realpath(path)}@{os.stat(words_file).st_mtime_ns}"
+
+        user_dict = cls.__new__(cls)
+        words, entries, arrays = resources.acquire(
+            key, partial(load_compiled_user_dict, path), user_dict
+        )
+        user_dict.__init__(words, entries, DoubleArrayTrie.from_files(arrays, words))
+        user_dict.resource_key = key
+        user_dict.path = path
+        return user_dict
+
+    def __reduce__(self):
+        # dictionaries are sent to worker processes by the path of their files if
+        # they were compiled, or by their tables, and the trie is built there.
+        if self.path is not None:
+            return receive_user_dict, (self.fingerprint, self.path, None)
+        return receive_user_dict, (self.fingerprint, None, self.tables)
+
+    @property
+    def nbytes(self):
+        # the bytes allocated for the dictionary, which are none if it is mapped.
+        if self.resource_key is not None:
+            return 0
+        size = sum(table.nbytes for table in self.tables)
+        if self.trie is not None:
+            size += self.trie._base.nbytes + self.trie._check.nbytes
+        return size
+
+
+def receive_user_dict(key, path, tables):
+    with _received_lock:
+        user_dict = _received.get(key)
+        if user_dict is not None:
+            _received.move_to_end(key)
+            return user_dict
+
+    if path is not None:
+        user_dict = UserDictionary.from_path(path)
+    else:
+        user_dict = UserDictionary(*tables, build_trie(tables[0]))
+
+    with _received_lock:
+        _received[key] = user_dict
+        while len(_received) > Tokenization.RECEIVED_USER_DICTS:
+            _received.popitem(last=False)
+    return user_dict
+
+
+def load_compiled_user_dict(path):
+    # the tables of one compilation all carry the fingerprint of its words.
+    for attempt in range(LOAD_ATTEMPTS):
+        if attempt > 0:
+            time.sleep(LOAD_RETRY_DELAY)
+        tables = [
+            read_table(os.path.join(path, filename))
+            for filename in [WORDS_FILE, ENTRIES_FILE, ARRAYS_FILE]
+        ]
+        # files compiled before the tables were stamped have no fingerprint.
+        fingerprints = {
+            (table.schema.metadata or {}).get(b"fingerprint") for table in tables
+        } - {None}
+        if len(fingerprints) <= 1:
+            return tables, 0, sum(table.nbytes for table in tables)
+    raise ValueError(f"The files of {path} are from different compilations.")
+
+
+def fingerprint(user_dict):
+    # identifies the entries, so that caches of other dictionaries are not reused.
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(user_dict, (str, os.PathLike)):
+        with open(user_dict, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        for token in sorted(user_dict):
+            digest.update(token.encode("utf-8", "surrogatepass") + b"\n")
+    return digest.hexdigest()
+
+
+def build_user_tables(char_definition, user_dict):
+    # `user_dict` is a list of words or the path of a mecab-ko-dic csv file.
+    if isinstance(user_dict, (str, os.PathLike)):
+        words, entries = read_csv(user_dict, UserDictionary.csv_defaults)
+        key = fingerprint(user_dict)
+    else:
+        user_token_info = UserDictionary.make_records(char_definition, user_dict)
+        words, entries = build_tables(
+            {token: [morph_inf] for token, morph_inf in user_token_info.items()}
+        )
+        key = fingerprint(user_token_info)
+    return words.replace_schema_metadata({"fingerprint": key}), entries
+
+
+def build_trie(words):
+    if words.num_rows == 0:
+        return None
+    return DoubleArrayTrie(dict.fromkeys(words["surface"].to_pylist(), 0))
+
+
+def load_user_dict(user_dict):
+    # a user dictionary to pass to the calls of a `PeCab`, from a list of words, a
+    # csv file or a directory written by `compile_user_dict`.
+    if isinstance(user_dict, (str, os.PathLike)) and os.path.isdir(user_dict):
+        return UserDictionary.from_path(user_dict)
+    return UserDictionary.build(CharacterDefinition(), user_dict)
+
+
+def compile_user_dict(entries, path):
+    words, entry_table = build_user_tables(CharacterDefinition(), entries)
+    write_dictionary(path, words, entry_table, build_trie(words))
+
+
+def write_dictionary(path, words, entries, trie, files=()):
+    # `files` are more (filename, write) pairs, where `write` takes a file object.
+    arrays = pa.table(
+        {
+            "base": pa.array(
+                np.asarray(trie._base) if trie is not None else [], pa.int32()
+            ),
+            "check": pa.array(
+                np.asarray(trie._check) if trie is not None else [], pa.int32()
+            ),
+        }
+    )
+    # the tables are stamped with the fingerprint of the words, and words.arrow
+    # is written last, since its modification time keys the loaded dictionary.
+    metadata = words.schema.metadata or {}
+    if b"fingerprint" in metadata:
+        fingerprint = {b"fingerprint": metadata[b"fingerprint"]}
+        entries = entries.replace_schema_metadata(
+            {**(entries.schema.metadata or {}), **fingerprint}
+        )
+        arrays = arrays.replace_schema_metadata(fingerprint)
+    files = list(files) + [
+        (filename, partial(write_table, table=table))
+        for filename, table in [
+            (ENTRIES_FILE, entries),
+            (ARRAYS_FILE, arrays),
+            (WORDS_FILE, words),
+        ]
+    ]
+
+    # files are replaced rather than overwritten, since other processes may have
+    # the previous ones mapped.
+    os.makedirs(path, exist_ok=True)
+    for filename, write in files:
+        with open(os.path.join(path, filename + ".tmp"), "wb") as f:
+            write(f)
+        os.replace(
+            os.path.join(path, filename + ".tmp"), os.path.join(path, filename)
+        )
@@ -0,0 +1,28 @@
+import pyarrow as pa
+
+
+def read_table(path):
+    # the table is memory mapped, so its buffers are shared through the page cache.
+    return pa.ipc.RecordBatchFileReader(pa.memory_map(path, mode="r")).read_all()
+
+
+def write_table(sink, table):
+    # `sink` is a path or a file object.
+    with pa.RecordBatchFileWriter(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def to_array(column):
+    if column.num_chunks == 1:
+        return column.chunk(0)
+    return column.combine_chunks()
+
+
+def to_numpy(array):
+    return array.to_numpy(zero_copy_only=True)
+
+
+def to_buffer(array):
+    # zero-copy numpy view of an mmapped arrow array, indexed through a
+    # memoryview so that lookups return plain python integers.
+    return memoryview(to_numpy(array))
@@ -1,3 +1,5 @@
+from pecab._utils._consts import CharProperty
+
 SPACE_SEPARATOR = [
     0x0020,
     0x00A0,
@@ -5311,27 +5313,51 @@ NON_SPACING_MARK = [
 ]
 
 
-def is_punctuation(ch):
+# every property list lies in the BMP, so they are compiled into one table of bit flags.
+PROPERTY_TABLE = bytearray(0x10000)
+for _flag, _tables in [
+    (CharProperty.SPACE_SEPARATOR, [SPACE_SEPARATOR]),
+    (CharProperty.NON_SPACING_MARK, [NON_SPACING_MARK]),
+    (
+        CharProperty.PUNCTUATION,
+        [
+            [0x318D],
+            SPACE_SEPARATOR,
+            LINE_SEPARATOR,
+            PARAGRAPH_SEPARATOR,
+            CONTROL,
+            FORMAT,
+            DASH_PUNCTUATION,
+            START_PUNCTUATION,
+            END_PUNCTUATION,
+            CONNECTOR_PUNCTUATION,
+            OTHER_PUNCTUATION,
+            MATH_SYMBOL,
+            CURRENCY_SYMBOL,
+            MODIFIER_SYMBOL,
+            OTHER_SYMBOL,
+            INITIAL_QUOTE_PUNCTUATION,
+            FINAL_QUOTE_PUNCTUATION,
+        ],
+    ),
+]:
+    for _table in _tables:
+        for _hex_ch in _table:
+            PROPERTY_TABLE[_hex_ch] |= _flag
+
+
+def _has_property(ch, flag):
     hex_ch = ord(ch)
-    if hex_ch == 0x318D:
-        return True
-    if (
-        hex_ch in SPACE_SEPARATOR
-        or hex_ch in LINE_SEPARATOR
-        or hex_ch in PARAGRAPH_SEPARATOR
-        or hex_ch in CONTROL
-        or hex_ch in FORMAT
-        or hex_ch in DASH_PUNCTUATION
-        or hex_ch in START_PUNCTUATION
-        or hex_ch in END_PUNCTUATION
-        or hex_ch in CONNECTOR_PUNCTUATION
-        or hex_ch in OTHER_PUNCTUATION
-        or hex_ch in MATH_SYMBOL
-        or hex_ch in CURRENCY_SYMBOL
-        or hex_ch in MODIFIER_SYMBOL
-        or hex_ch in OTHER_SYMBOL
-        or hex_ch in INITIAL_QUOTE_PUNCTUATION
-        or hex_ch in FINAL_QUOTE_PUNCTUATION
-    ):
-        return True
-    return False
+    return hex_ch < 0x10000 and PROPERTY_TABLE[hex_ch] & flag != 0
+
+
+def is_punctuation(ch):
+    return _has_property(ch, CharProperty.PUNCTUATION)
+
+
+def is_space_separator(ch):
+    return _has_property(ch, CharProperty.SPACE_SEPARATOR)
+
+
+def is_non_spacing_mark(ch):
+    return _has_property(ch, CharProperty.NON_SPACING_MARK)
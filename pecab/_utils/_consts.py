@@ -14,4 +14,18 @@ class Type:
 class Tokenization:
     MIN_CHAR_LENGTH = 7
     MAX_UNKNOWN_WORD_LENGTH = 1024
+    MAX_EOJEOL_LENGTH = 64
     CONN_SHAPE = (3822, 2693)
+    CACHE_SIZE = 5000
+    DISK_CACHE_BYTES = 1 << 30
+    BATCH_SIZE = 256
+    MAX_IN_FLIGHT = 32
+    STREAM_CHUNK_SIZE = 65536
+    STREAM_LOOKAHEAD = 2048
+    RECEIVED_USER_DICTS = 16
+
+
+class CharProperty:
+    SPACE_SEPARATOR = 1
+    NON_SPACING_MARK = 2
+    PUNCTUATION = 4
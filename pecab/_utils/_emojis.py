@@ -1,43 +1,53 @@
-import emoji
-import regex
-
-_emojis = {}
-_unicodes = [
-    "‍",  # Zero width joiner
-    "︀",  # Variation Selector-1
-    "︁",  # Variation Selector-2
-    "︂",  # Variation Selector-3
-    "︃",  # Variation Selector-4
-    "︄",  # Variation Selector-5
-    "︅",  # Variation Selector-6
-    "︆",  # Variation Selector-7
-    "︇",  # Variation Selector-8
-    "︈",  # Variation Selector-9
-    "︉",  # Variation Selector-10
-    "︊",  # Variation Selector-11
-    "︋",  # Variation Selector-12
-    "︌",  # Variation Selector-13
-    "︍",  # Variation Selector-14
-    "︎",  # Variation Selector-15
-    "️",  # Variation Selector-16
-]
-
-
-try:
-    for lang in ["pt", "it", "es", "en"]:
-        _emojis.update(emoji.unicode_codes.UNICODE_EMOJI[lang])
-except Exception as e:
-    raise ImportError("pecab requires `emoji==1.2.0`. please install that version.")
-
-_emojis.update({k: "unicode" for k in _unicodes})
+import os
+from functools import lru_cache
+
+PATH = os.path.dirname(os.path.dirname(__file__))
+
+
+@lru_cache(maxsize=1)
+def load_emoji_trie():
+    # nested dicts keyed by character, `None` marks the end of a sequence.
+    trie = {}
+    with open(os.path.join(PATH, "_resources", "emojis.txt"), encoding="utf-8") as fp:
+        for line in fp:
+            code_points = line.split("#")[0].split()
+            if not code_points:
+                continue
+
+            node = trie
+            for code_point in code_points:
+                node = node.setdefault(chr(int(code_point, 16)), {})
+            node[None] = True
+    return trie
+
+
+def find_emojis(text):
+    # returns (start, end) of the longest emoji sequence at each match, in one scan.
+    trie = load_emoji_trie()
+    spans = []
+    if trie.keys().isdisjoint(text):
+        return spans
+
+    start = 0
+    length = len(text)
+    while start < length:
+        node = trie.get(text[start])
+        end = start
+        pos = start
+        while node is not None:
+            pos += 1
+            if None in node:
+                end = pos
+            node = node.get(text[pos]) if pos < length else None
+
+        if end > start:
+            spans.append((start, end))
+            start = end
+        else:
+            start += 1
+
+    return spans
 
 
 def get_emoji(text):
-    emoji_list = []
-    flags = regex.findall("[\U0001F1E6-\U0001F1FF]", text)
-
-    for grapheme in regex.findall(r"\X", text):
-        if any(char in _emojis for char in grapheme):
-            emoji_list.append(grapheme)
-
-    return emoji_list + flags
+    return [text[start:end] for start, end in find_emojis(text)]
@@ -0,0 +1,29 @@
+import argparse
+
+from pecab._compiler import compile_dictionary
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pecab.compile",
+        description="Builds the dictionary files of the analyzer from the sources "
+        "of mecab-ko-dic: its csv files, matrix.def, unk.def and char.def.",
+    )
+    parser.add_argument(
+        "--dic-dir", required=True, help="directory of the mecab-ko-dic sources"
+    )
+    parser.add_argument(
+        "--out", required=True, help="directory to write the dictionary files to"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of csv files read at once",
+    )
+    args = parser.parse_args(args)
+    compile_dictionary(args.dic_dir, args.out, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,15 +32,17 @@ setup(
     install_requires=[
         "numpy",
         "pyarrow",
-        "regex",
-        "emoji==1.2.0",
         "pytest"
     ],
     package_data={
         "": [
             "pecab/_resources/arrays.arrow",
             "pecab/_resources/words.arrow",
+            "pecab/_resources/entries.arrow",
             "pecab/_resources/matrix.npy",
+            "pecab/_resources/chars.npy",
+            "pecab/_resources/emojis.txt",
+            "pecab/_resources/unk.def",
         ]
     },
     include_package_data=True,
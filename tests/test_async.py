@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pecab import PeCab
+
+texts = [
+    "아버지가방에들어가시다",
+    "이것은 문장입니다.",
+    "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+    "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=8)
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.running = 0
+        self.max_running = 0
+
+    def submit(self, fn, *args, **kwargs):
+        with self.lock:
+            self.submitted += 1
+        return super().submit(self.track, fn, *args, **kwargs)
+
+    def track(self, fn, *args, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_async():
+    pecab = PeCab()
+    executor = CountingExecutor()
+    pecab.set_executor(executor, max_in_flight=2)
+
+    async def main():
+        outputs = await asyncio.gather(*[pecab.apos(text) for text in texts * 5])
+        assert outputs == [pecab.pos(text) for text in texts * 5]
+        assert await pecab.anouns(texts[2]) == pecab.nouns(texts[2])
+        assert await pecab.amorphs(texts[0]) == pecab.morphs(texts[0])
+
+    asyncio.run(main())
+    assert executor.submitted == len(texts) + 2
+    assert executor.max_running <= 2
+
+
+def test_apipe():
+    pecab = PeCab()
+
+    async def generate():
+        for text in texts * 5:
+            yield text
+
+    async def main():
+        return [output async for output in pecab.apipe(generate(), batch_size=3)]
+
+    assert asyncio.run(main()) == pecab.pos_batch(texts * 5)
+
+
+def test_async_process_executor():
+    pecab = PeCab(user_dict=["삼성디지털프라자"])
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        pecab.set_executor(executor)
+
+        async def main():
+            outputs = [output async for output in pecab.apipe(texts, method="nouns")]
+            return outputs, await pecab.apos(texts[3])
+
+        outputs, output = asyncio.run(main())
+    assert outputs == pecab.nouns_batch(texts)
+    assert output == pecab.pos(texts[3])
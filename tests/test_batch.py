@@ -0,0 +1,25 @@
+from pecab import PeCab
+from tests import pecab, pecab_with_userdict   # noqa
+
+texts = [
+    "아버지가방에들어가시다",
+    "이것은 문장입니다.",
+    "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+    "이것은 문장입니다.",
+    "",
+    "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+]
+
+
+def test_batch(pecab: PeCab):
+    assert pecab.pos_batch(texts) == [pecab.pos(text) for text in texts]
+    assert pecab.morphs_batch(iter(texts)) == [pecab.morphs(text) for text in texts]
+    assert pecab.nouns_batch(texts, drop_space=False) == [
+        pecab.nouns(text, drop_space=False) for text in texts
+    ]
+
+
+def test_batch_with_userdict(pecab_with_userdict: PeCab):
+    assert pecab_with_userdict.pos_batch(texts) == [
+        pecab_with_userdict.pos(text) for text in texts
+    ]
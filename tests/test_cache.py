@@ -0,0 +1,65 @@
+import gc
+import weakref
+
+import pytest
+
+from pecab import PeCab
+from tests import pecab   # noqa
+
+
+def test_cache_is_immutable(pecab: PeCab):
+    text = "이것은 캐시 테스트 문장입니다."
+    output = pecab._tokenize(text)
+    with pytest.raises(AttributeError):
+        output.terms.append("x")
+
+    morphs = pecab.morphs(text)
+    morphs.append("x")
+    assert pecab.morphs(text) == morphs[:-1]
+
+
+def test_cache_info():
+    pecab = PeCab(cache_size=2)
+    for text in ["하나", "둘", "하나", "셋", "넷"]:
+        pecab.pos(text)
+
+    info = pecab.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.entries) == (1, 4, 2, 2)
+
+    pecab.clear_cache()
+    info = pecab.cache_info()
+    assert (info.hits, info.misses, info.entries, info.bytes) == (0, 0, 0, 0)
+
+
+def test_cache_bytes():
+    pecab = PeCab(cache_size=None, cache_bytes=20000)
+    texts = [f"아버지가방에들어가시다 {i}" for i in range(100)]
+    outputs = [pecab.pos(text) for text in texts]
+    info = pecab.cache_info()
+    assert 0 < info.bytes <= 20000 and info.evictions > 0
+    assert [pecab.pos(text) for text in texts] == outputs
+
+    disabled = PeCab(cache_size=0)
+    disabled.pos(texts[0])
+    assert disabled.cache_info().entries == 0
+
+
+def test_instance_is_freed():
+    pecab = PeCab()
+    pecab.pos("아버지가방에들어가시다")
+    ref = weakref.ref(pecab)
+    del pecab
+    gc.collect()
+    assert ref() is None
+
+
+def test_batch_uses_cache():
+    pecab = PeCab()
+    texts = ["하나", "둘", "하나"]
+    outputs = pecab.pos_batch(texts)
+    info = pecab.cache_info()
+    assert (info.hits, info.misses, info.entries) == (0, 2, 2)
+
+    assert pecab.pos_batch(texts) == outputs
+    assert [pecab.pos(text) for text in texts] == outputs
+    assert pecab.cache_info().hits == 5
@@ -0,0 +1,16 @@
+from pecab._utils._char_definition import CharacterDefinition
+from pecab._utils._consts import CharProperty
+
+
+def test_char_category():
+    text, categories, properties, _ = CharacterDefinition.normalize("가a1😀\U0001F1F0\x00")
+    assert text == "가a1😀\U0001F1F0 "
+    assert [CharacterDefinition.get_character_class(c) for c in categories] == [
+        "HANGUL",
+        "ALPHA",
+        "NUMERIC",
+        "EMOJI",
+        "EMOJI",
+        "SPACE",
+    ]
+    assert properties[-1] & CharProperty.SPACE_SEPARATOR
@@ -0,0 +1,15 @@
+from pecab import PeCab
+from tests import pecab   # noqa
+
+
+def test_common_prefix_search(pecab: PeCab):
+    trie = pecab.tokenizer.known_dict
+    text = "아버지가방에들어가시다"
+
+    for start in range(len(text)):
+        expected = [
+            (end, trie._exact_match_search(text[start:end]))
+            for end in range(start + 1, len(text) + 1)
+            if trie._exact_match_search(text[start:end]) >= 0
+        ]
+        assert trie.common_prefix_search(text, start) == expected
@@ -0,0 +1,97 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from pecab._compiler import read_char_def, read_entries, read_matrix
+from pecab._datrie import DoubleArrayTrie
+from pecab._entries import EntryTable
+from pecab._tokenizer import PATH
+from pecab._utils._arrow import read_table
+from pecab.compile import main
+
+ASSETS = os.path.join(os.path.dirname(PATH), "assets")
+RESOURCES = os.path.join(PATH, "_resources")
+
+shards = {
+    "NNG.csv": """\
+사과,1780,3533,2000,NNG,*,F,사과,*,*,*,*
+가격경쟁,1780,3533,1500,NNG,*,T,가격경쟁,Compound,*,*,가격/NNG/*+경쟁/NNG/*
+""",
+    "VV.csv": """\
+사과,2421,3574,4000,VV,*,F,사과,*,*,*,*
+""",
+}
+
+
+def write_dic_dir(tmp_path, shape=(3822, 2693)):
+    dic_dir = os.path.join(tmp_path, "dic")
+    os.makedirs(dic_dir)
+    for filename, rows in shards.items():
+        with open(os.path.join(dic_dir, filename), "w", encoding="utf-8") as f:
+            f.write(rows)
+    with open(os.path.join(dic_dir, "matrix.def"), "w") as f:
+        f.write(f"{shape[0]} {shape[1]}\n3533 1780 -120\n3574 2421 35\n")
+    shutil.copy(os.path.join(ASSETS, "char.def"), dic_dir)
+    shutil.copy(os.path.join(RESOURCES, "unk.def"), dic_dir)
+    return dic_dir
+
+
+def test_compile_entries(tmp_path):
+    dic_dir = write_dic_dir(tmp_path)
+    words, entries = read_entries(
+        [os.path.join(dic_dir, filename) for filename in sorted(shards)]
+    )
+    assert words["surface"].to_pylist() == ["가격경쟁", "사과"]
+
+    table = EntryTable(words, entries)
+    assert [table.get_entry(row) for row in table.get_rows(1)] == [
+        (1780, 3533, 2000, "NNG", "MORP"),
+        (2421, 3574, 4000, "VV", "MORP"),
+    ]
+    assert table.get_morphemes(0) == [("NNG", "가격"), ("NNG", "경쟁")]
+
+
+def test_compile_matrix(tmp_path):
+    matrix = read_matrix(os.path.join(write_dic_dir(tmp_path), "matrix.def"))
+    assert matrix.shape == (3822, 2693)
+    assert matrix[3533, 1780] == -120 and matrix[3574, 2421] == 35
+    assert np.count_nonzero(matrix) == 2
+
+
+def test_compile_chars():
+    assert np.array_equal(
+        read_char_def(os.path.join(ASSETS, "char.def")),
+        np.load(os.path.join(RESOURCES, "chars.npy")),
+    )
+
+
+def test_compile(tmp_path):
+    out = os.path.join(tmp_path, "out")
+    main(["--dic-dir", write_dic_dir(tmp_path), "--out", out])
+
+    words = read_table(os.path.join(out, "words.arrow"))
+    arrays = read_table(os.path.join(out, "arrays.arrow"))
+    trie = DoubleArrayTrie.from_files(arrays, words)
+    assert [word_id for _, word_id in trie.common_prefix_search("사과를")] == [1]
+
+    matrix = np.memmap(
+        os.path.join(out, "matrix.npy"), dtype="int16", mode="r", shape=(3822, 2693)
+    )
+    assert matrix[3533, 1780] == -120
+    assert np.array_equal(
+        np.load(os.path.join(out, "chars.npy")),
+        np.load(os.path.join(RESOURCES, "chars.npy")),
+    )
+    with open(os.path.join(out, "unk.def"), encoding="utf-8") as f:
+        assert f.read().startswith("DEFAULT,")
+
+
+def test_compile_shape(tmp_path):
+    out = os.path.join(tmp_path, "out")
+    for shape in [(4000, 3000), (10, 10)]:
+        dic_dir = write_dic_dir(os.path.join(tmp_path, str(shape[0])), shape)
+        with pytest.raises(ValueError):
+            main(["--dic-dir", dic_dir, "--out", out])
+    assert not os.path.exists(out)
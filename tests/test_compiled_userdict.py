@@ -0,0 +1,65 @@
+import os
+import shutil
+
+import pytest
+
+from pecab import PeCab, _user_dict, compile_user_dict
+from tests import pecab_with_userdict  # noqa
+
+text = "저는 삼성디지털프라자에서 지펠냉장고를 샀어요."
+
+
+def test_compiled_userdict(pecab_with_userdict: PeCab, tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict(["삼성디지털프라자", "지펠냉장고"], path)
+    pecab = PeCab(user_dict_path=path)
+    assert pecab.pos(text) == pecab_with_userdict.pos(text)
+    assert (
+        pecab.tokenizer.user_dict.fingerprint
+        == pecab_with_userdict.tokenizer.user_dict.fingerprint
+    )
+
+
+def test_compiled_userdict_empty(tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict([], path)
+    assert PeCab(user_dict_path=path).pos(text) == PeCab().pos(text)
+
+
+def test_compiled_userdict_recompile(tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict(["삼성디지털프라자"], path)
+    pecab = PeCab(user_dict_path=path)
+    compile_user_dict(["지펠냉장고"], path)
+    assert ("삼성디지털프라자", "NNG") in pecab.pos(text)
+    assert ("지펠냉장고", "NNG") in PeCab(user_dict_path=path).pos(text)
+
+
+def test_compiled_userdict_with_user_dict(tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict(["삼성디지털프라자"], path)
+    with pytest.raises(ValueError):
+        PeCab(user_dict=["지펠냉장고"], user_dict_path=path)
+
+
+def test_compiled_userdict_mixed_files(tmp_path, monkeypatch):
+    # a dictionary loaded while it is compiled again never mixes both versions.
+    old, new = os.path.join(tmp_path, "old"), os.path.join(tmp_path, "new")
+    compile_user_dict(["삼성디지털프라자"], old)
+    compile_user_dict(["지펠냉장고", "삼성디지털프라자"], new)
+    shutil.copy(os.path.join(new, _user_dict.ENTRIES_FILE), old)
+
+    # the files left are written while the loader waits.
+    def finish_compile(delay):
+        for filename in [_user_dict.ARRAYS_FILE, _user_dict.WORDS_FILE]:
+            shutil.copy(os.path.join(new, filename), old)
+
+    monkeypatch.setattr(_user_dict.time, "sleep", finish_compile)
+    assert ("지펠냉장고", "NNG") in PeCab(user_dict_path=old).pos(text)
+
+    # the words of another compilation next to these tables are never used.
+    compile_user_dict(["삼성디지털프라자"], new)
+    shutil.copy(os.path.join(new, _user_dict.WORDS_FILE), old)
+    monkeypatch.setattr(_user_dict.time, "sleep", lambda delay: None)
+    with pytest.raises(ValueError):
+        PeCab(user_dict_path=old)
@@ -0,0 +1,17 @@
+from pecab import PeCab
+from tests import pecab   # noqa
+
+label = [
+    ("내셔", "NNP"),
+    ("날", "NNG"),
+    ("에듀", "NNP"),
+    ("영치기 영차", "IC"),
+    ("캘리", "NNP"),
+    ("콜라", "NNG"),
+    ("비", "NNG"),
+]
+
+
+def test_cost_overflow(pecab: PeCab):
+    # path costs of this sentence exceed the int16 range of the connection matrix
+    assert pecab.pos("내셔날 에듀 영치기 영차 캘리 콜라비") == label
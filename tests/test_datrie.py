@@ -0,0 +1,28 @@
+import random
+
+from pecab._datrie import DoubleArrayTrie
+
+
+def test_build():
+    random.seed(0)
+    chars = ["가", "각", "a", "😀", "\ud800", "\U0010ffff"]
+    chars += [chr(0xAC00 + i) for i in range(50)]
+    keys = {"".join(random.choices(chars, k=random.randint(1, 6))) for _ in range(3000)}
+    # prefixes of each other, and a wide node at the root.
+    keys |= {"가", "가가", "가가가", ""} | {chr(0x4E00 + i) for i in range(500)}
+    keys = sorted(keys)
+    trie = DoubleArrayTrie(dict.fromkeys(keys, 0))
+
+    assert [trie._exact_match_search(key) for key in keys] == list(range(len(keys)))
+    for key in ["가가가가가가가", "b", "😀😀😀😀😀😀😀", "\ud801"]:
+        assert trie._exact_match_search(key) == (
+            keys.index(key) if key in keys else -1
+        )
+
+    text = "".join(random.choices(chars, k=200))
+    for start in range(len(text)):
+        assert trie.common_prefix_search(text, start) == [
+            (end, keys.index(text[start:end]))
+            for end in range(start + 1, len(text) + 1)
+            if text[start:end] in keys
+        ]
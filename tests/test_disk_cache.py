@@ -0,0 +1,49 @@
+from pecab import PeCab, _disk_cache
+from tests import pecab   # noqa
+
+texts = [
+    "아버지가방에들어가시다",
+    "이것은 문장입니다.",
+    "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+    "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+    "가족👨‍👩‍👧 사진 🇰🇷",
+]
+
+
+def test_disk_cache(pecab: PeCab, tmp_path):
+    path = str(tmp_path / "analyses.db")
+    writer = PeCab(disk_cache=path)
+    assert [writer.pos(text) for text in texts] == [pecab.pos(text) for text in texts]
+    assert writer.disk_cache_info().entries == len(texts)
+
+    # a new process, or a restart, reads the analyses back from the file.
+    reader = PeCab(disk_cache=path)
+    assert reader.pos_batch(texts + ["새 문장"]) == pecab.pos_batch(texts + ["새 문장"])
+    # the batch filled the memory cache, which is consulted before the file.
+    reader.clear_cache()
+    assert reader._tokenize(texts[0]) == pecab._tokenize(texts[0])
+    info = reader.disk_cache_info()
+    assert (info.hits, info.misses, info.entries) == (len(texts) + 1, 1, len(texts) + 1)
+
+    # analyses of another configuration are not shared.
+    other = PeCab(disk_cache=path, split_compound=True)
+    other.pos(texts[0])
+    assert other.disk_cache_info().misses == 1
+
+
+def test_disk_cache_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(_disk_cache, "EVICTION_INTERVAL", 1)
+    analyzer = PeCab(disk_cache=str(tmp_path / "analyses.db"), disk_cache_bytes=1000)
+    for i in range(50):
+        analyzer.pos(f"이것은 {i}번째 문장입니다.")
+
+    info = analyzer.disk_cache_info()
+    assert 0 < info.bytes <= 1000 and info.evictions > 0
+
+
+def test_disk_cache_processes(pecab: PeCab, tmp_path):
+    analyzer = PeCab(disk_cache=str(tmp_path / "analyses.db"))
+    many_texts = [f"{text} {i}" for i in range(20) for text in texts]
+    outputs = list(analyzer.pipe(many_texts, n_process=2, batch_size=10))
+    assert outputs == pecab.pos_batch(many_texts)
+    assert analyzer.disk_cache_info().entries == len(many_texts)
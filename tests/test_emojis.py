@@ -0,0 +1,26 @@
+from pecab import PeCab
+from pecab._utils._emojis import find_emojis
+from tests import pecab  # noqa
+
+
+def test_find_emojis():
+    text = "가족👨‍👩‍👧 🇰🇷🇯🇵 ❤️ 1️⃣ 👍🏽😀 1"
+    assert [text[start:end] for start, end in find_emojis(text)] == [
+        "👨‍👩‍👧",
+        "🇰🇷",
+        "🇯🇵",
+        "❤️",
+        "1️⃣",
+        "👍🏽",
+        "😀",
+    ]
+    assert find_emojis("아버지가 방에 들어가신다") == []
+
+
+def test_emoji_tokens(pecab: PeCab):
+    assert pecab.pos("가족👨‍👩‍👧 사진") == [
+        ("가족", "NNG"),
+        ("👨‍👩‍👧", "SY"),
+        ("사진", "NNG"),
+    ]
+    assert pecab.morphs("🇰🇷🇯🇵😀😀") == ["🇰🇷", "🇯🇵", "😀", "😀"]
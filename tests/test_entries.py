@@ -0,0 +1,23 @@
+from pecab import PeCab
+from tests import pecab   # noqa
+
+
+def test_entries(pecab: PeCab):
+    tokenizer = pecab.tokenizer
+    word_idx = tokenizer.known_dict._exact_match_search("ㄴ들")
+    entries = [
+        tokenizer.known_entries.get_entry(row)
+        for row in tokenizer.known_entries.get_rows(word_idx)
+    ]
+    assert entries == [
+        (2, 4, 2124, "EC", "MORP"),
+        (259, 428, 1854, "JKB", "MORP"),
+        (546, 1707, 1843, "JX", "MORP"),
+    ]
+
+
+def test_morphemes(pecab: PeCab):
+    tokenizer = pecab.tokenizer
+    word_idx = tokenizer.known_dict._exact_match_search("가가대소")
+    (row,) = tokenizer.known_entries.get_rows(word_idx)
+    assert tokenizer.known_entries.get_morphemes(row) == [("NNG", "가가"), ("NNG", "대소")]
@@ -0,0 +1,56 @@
+import random
+
+from pecab import PeCab
+from tests import pecab, pecab_with_split_compound, pecab_with_userdict   # noqa
+
+sentences = [
+    "아버지가방에들어가시다",
+    "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+    "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+    "내셔날 에듀 영치기 영차 캘리 콜라비",
+    "가족👨‍👩‍👧 사진 🇰🇷 최고  👍🏽",
+    "  오늘 날씨가\t정말 좋네요!  ",
+]
+
+
+def make_texts():
+    random.seed(0)
+    eojeols = " ".join(sentences).split()
+    return sentences + [
+        " ".join(random.choice(eojeols) for _ in range(random.randint(1, 8)))
+        for _ in range(100)
+    ]
+
+
+def test_eojeol_cache(pecab: PeCab):
+    texts = make_texts()
+    cached = PeCab(cache_size=0, eojeol_cache_size=None)
+    for _ in range(2):
+        for text in texts:
+            assert cached.pos(text, drop_space=False) == pecab.pos(
+                text, drop_space=False
+            )
+
+    info = cached.eojeol_cache_info()
+    assert info.hits > info.misses > 0 and 0 < info.hit_rate < 1
+
+    cached.clear_cache()
+    assert cached.eojeol_cache_info().entries == 0
+    assert pecab.eojeol_cache_info() is None
+
+
+def test_eojeol_cache_with_userdict(pecab_with_userdict: PeCab):
+    cached = PeCab(
+        user_dict=pecab_with_userdict.user_dict,
+        cache_size=0,
+        eojeol_cache_size=100,
+    )
+    for text in make_texts()[:30]:
+        assert cached.pos(text) == pecab_with_userdict.pos(text)
+    assert cached.eojeol_cache_info().entries <= 100
+
+
+def test_eojeol_cache_with_split_compound(pecab_with_split_compound: PeCab):
+    cached = PeCab(split_compound=True, cache_size=0, eojeol_cache_size=None)
+    for text in make_texts()[:30]:
+        assert cached.pos(text) == pecab_with_split_compound.pos(text)
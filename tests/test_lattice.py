@@ -0,0 +1,16 @@
+from pecab import PeCab
+from tests import pecab   # noqa
+
+
+def test_lattice_reuse(pecab: PeCab):
+    text = "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다. " * 20
+    pecab.pos(text)
+    (state,) = pecab.tokenizer.states
+    size = len(state.positions.positions)
+
+    for i in range(10):
+        pecab.pos(text + str(i))
+        pecab.pos("아버지가방에들어가시다" + str(i))
+
+    assert pecab.tokenizer.states == [state]
+    assert len(state.positions.positions) == size
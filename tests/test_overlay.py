@@ -0,0 +1,67 @@
+import asyncio
+import gc
+import os
+import pickle
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from pecab import PeCab, compile_user_dict, load_user_dict
+from tests import pecab, pecab_with_userdict  # noqa
+
+text = "저는 삼성디지털프라자에서 지펠냉장고를 샀어요."
+
+
+def test_overlay(pecab: PeCab, pecab_with_userdict: PeCab):
+    overlay = load_user_dict(["삼성디지털프라자", "지펠냉장고"])
+    assert pecab.pos(text, user_dict=overlay) == pecab_with_userdict.pos(text)
+    assert pecab.morphs(text, user_dict=overlay) == pecab_with_userdict.morphs(text)
+    assert pecab.nouns(text, user_dict=overlay) == pecab_with_userdict.nouns(text)
+    assert pecab.pos_batch([text], user_dict=overlay) == [pecab_with_userdict.pos(text)]
+    expected = pecab_with_userdict.pos(text)
+    assert list(pecab.iter_pos(text, user_dict=overlay)) == expected
+    # the instance's own dictionary is left as it is.
+    assert pecab.pos(text) == PeCab(cache_size=0).pos(text)
+
+
+def test_overlay_from_path(pecab_with_userdict: PeCab, tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict(["삼성디지털프라자", "지펠냉장고"], path)
+    pecab = PeCab(user_dict=["지펠"], eojeol_cache_size=1000)
+    overlays = [load_user_dict(path), load_user_dict(["지펠냉장고"])]
+    for _ in range(2):
+        assert pecab.pos(text, user_dict=overlays[0]) == pecab_with_userdict.pos(text)
+        assert ("지펠냉장고", "NNG") in pecab.pos(text, user_dict=overlays[1])
+        assert ("지펠", "NNG") in pecab.pos(text)
+
+
+def test_overlay_in_workers(pecab_with_userdict: PeCab, tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict(["삼성디지털프라자", "지펠냉장고"], path)
+    expected = pecab_with_userdict.pos(text)
+    for overlay in [load_user_dict(["삼성디지털프라자", "지펠냉장고"]), load_user_dict(path)]:
+        received = pickle.loads(pickle.dumps(overlay))
+        assert received.fingerprint == overlay.fingerprint
+        assert pickle.loads(pickle.dumps(overlay)) is received
+
+        pecab = PeCab()
+        outputs = pecab.pipe([text] * 4, n_process=2, batch_size=1, user_dict=overlay)
+        assert list(outputs) == [expected] * 4
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            pecab.set_executor(executor)
+
+            async def main():
+                return await pecab.apos(text, user_dict=overlay), [
+                    output async for output in pecab.apipe([text], user_dict=overlay)
+                ]
+
+            assert asyncio.run(main()) == (expected, [expected])
+
+
+def test_overlay_is_freed(pecab: PeCab):
+    overlay = load_user_dict(["지펠냉장고"])
+    pecab.pos(text, user_dict=overlay)
+    ref = weakref.ref(overlay)
+    del overlay
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,49 @@
+import multiprocessing
+
+import pytest
+
+from pecab import PeCab
+from tests import pecab, pecab_with_userdict   # noqa
+
+texts = [
+    "아버지가방에들어가시다",
+    "이것은 문장입니다.",
+    "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+    "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+] * 5
+
+
+def test_pipe(pecab: PeCab):
+    assert list(pecab.pipe(iter(texts), batch_size=3)) == pecab.pos_batch(texts)
+    assert list(pecab.pipe(texts, method="nouns", n_process=2, batch_size=3)) == [
+        pecab.nouns(text) for text in texts
+    ]
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="workers are not forked"
+)
+def test_pipe_uses_parent_cache():
+    pecab = PeCab()
+    outputs = list(pecab.pipe(texts))
+    assert pecab.cache_info().entries == len(set(texts))
+
+    # forked workers inherit the warm cache, so they never analyze these texts.
+    def fail(*args):
+        raise AssertionError("the text should have been cached.")
+
+    pecab.tokenizer.tokenize_normalized = fail
+    assert list(pecab.pipe(texts, n_process=2, batch_size=3)) == outputs
+
+
+def test_pipe_with_userdict(pecab_with_userdict: PeCab):
+    assert list(pecab_with_userdict.pipe(texts, n_process=2, batch_size=4)) == [
+        pecab_with_userdict.pos(text) for text in texts
+    ]
+
+
+def test_pipe_arguments(pecab: PeCab):
+    with pytest.raises(ValueError):
+        pecab.pipe(texts, method="tokens")
+    with pytest.raises(ValueError):
+        pecab.pipe(texts, n_process=0)
@@ -0,0 +1,38 @@
+import gc
+import os
+
+from pecab import PeCab, compile_user_dict, resources
+
+
+def test_resources_are_shared():
+    first, second = PeCab(), PeCab(split_compound=True)
+    assert first.tokenizer.known_dict is second.tokenizer.known_dict
+    assert first.tokenizer.conn_costs is second.tokenizer.conn_costs
+
+    refcount = resources.info("matrix.npy").refcount
+    del second
+    gc.collect()
+    assert resources.info("matrix.npy").refcount == refcount - 1
+
+
+def test_compiled_userdict_is_shared(tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict(["삼성디지털프라자", "지펠냉장고"], path)
+    first, second = PeCab(user_dict_path=path), PeCab(user_dict_path=path)
+    key = first.tokenizer.user_dict.resource_key
+    assert key == second.tokenizer.user_dict.resource_key
+    assert resources.info(key).refcount == 2
+
+    del first, second
+    gc.collect()
+    assert key not in resources
+
+
+def test_memory_footprint():
+    pecab = PeCab(user_dict=["지펠냉장고"])
+    pecab.pos("저는 삼성디지털프라자에서 지펠냉장고를 샀어요.")
+    footprint = pecab.memory_footprint()
+    assert {"words.arrow", "matrix.npy", "known_dict"} <= set(footprint.shared)
+    assert footprint.mapped_bytes > footprint.shared_bytes > 0
+    assert footprint.instance["cache"] > 0 and footprint.instance["user_dict"] > 0
+    assert footprint.instance_bytes == sum(footprint.instance.values())
@@ -0,0 +1,56 @@
+import io
+
+from pecab import PeCab
+from tests import pecab, pecab_with_userdict   # noqa
+
+text = "\n".join(
+    [
+        "아버지가방에들어가시다",
+        "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+        "가족👨‍👩‍👧 사진 🇰🇷 ❤️ 최고 👍🏽",
+        "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+    ]
+    * 50
+)
+
+
+def test_stream(pecab: PeCab):
+    expected = pecab.pos(text)
+    assert list(pecab.iter_pos(text)) == expected
+    assert list(pecab.iter_pos(io.StringIO(text), chunk_size=37)) == expected
+    assert list(pecab.iter_pos(io.StringIO(text), drop_space=False)) == pecab.pos(
+        text, drop_space=False
+    )
+    assert list(pecab.iter_pos(io.StringIO(""))) == []
+    assert list(pecab.iter_pos("ㅋㅋㅋㅋㅋㅋㅋ하하하")) == pecab.pos("ㅋㅋㅋㅋㅋㅋㅋ하하하")
+
+
+def test_stream_memory(pecab: PeCab):
+    # the state is put in the pool first, so that the stream picks it up.
+    state = pecab.tokenizer.acquire_state()
+    pecab.tokenizer.states.append(state)
+
+    sizes = []
+    for _ in pecab.iter_pos(io.StringIO(text * 4), chunk_size=100):
+        sizes.append(len(state.buffer.text))
+    assert max(sizes) < 4096
+
+
+def test_stream_with_userdict(pecab_with_userdict: PeCab):
+    stream = io.StringIO(text)
+    assert list(pecab_with_userdict.iter_pos(stream, chunk_size=64)) == (
+        pecab_with_userdict.pos(text)
+    )
+
+
+def test_stream_without_spaces(pecab: PeCab):
+    # a text without whitespace is never cut, even in an emoji sequence.
+    long_text = "가족👨‍👩‍👧사진🇰🇷최고👍🏽아버지가방에들어가시다" * 40
+    for stream_text in [long_text, f"{long_text}\t{long_text}　끝"]:
+        expected = pecab.pos(stream_text, drop_space=False)
+        for chunk_size in [5, 37, 64]:
+            stream = io.StringIO(stream_text)
+            assert (
+                list(pecab.iter_pos(stream, drop_space=False, chunk_size=chunk_size))
+                == expected
+            )
@@ -0,0 +1,28 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from pecab import PeCab
+
+texts = [
+    f"{text} {i}"
+    for i in range(50)
+    for text in [
+        "아버지가방에들어가시다",
+        "자장면을 먹을까? 짬뽕을 먹을까? 그것이 고민이로다.",
+        "저는 삼성디지털프라자에서 지펠냉장고를 샀어요.",
+    ]
+]
+
+
+def test_threads():
+    expected = [PeCab().pos(text) for text in texts]
+    pecab = PeCab()
+    # switch threads as often as possible, so that they would interleave mid-parse.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert list(executor.map(pecab.pos, texts)) == expected
+    finally:
+        sys.setswitchinterval(interval)
+    assert len(pecab.tokenizer.states) <= 8
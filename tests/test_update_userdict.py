@@ -0,0 +1,84 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from pecab import PeCab, compile_user_dict
+from pecab._utils._consts import Tokenization
+from tests import pecab_with_userdict  # noqa
+
+text = "저는 삼성디지털프라자에서 지펠냉장고를 샀어요."
+
+
+def test_update_userdict(pecab_with_userdict: PeCab):
+    pecab = PeCab()
+    before = pecab.pos(text)
+    pecab.update_user_dict(add=["삼성디지털프라자", "지펠냉장고"])
+    assert pecab.pos(text) == pecab_with_userdict.pos(text)
+
+    pecab.update_user_dict(remove=["삼성디지털프라자"])
+    assert ("삼성디지털프라자", "NNG") not in pecab.pos(text)
+    assert ("지펠냉장고", "NNG") in pecab.pos(text)
+
+    pecab.update_user_dict(remove=["지펠냉장고"])
+    assert pecab.pos(text) == before
+
+
+def test_update_userdict_caches(tmp_path):
+    # analyses cached with the previous dictionary are not returned after an update.
+    pecab = PeCab(eojeol_cache_size=1000, disk_cache=str(tmp_path / "analyses.db"))
+    before = pecab.pos(text)
+    pecab.pos_batch([text])
+    pecab.update_user_dict(add=["지펠냉장고"])
+    assert ("지펠냉장고", "NNG") in pecab.pos(text)
+    assert ("지펠냉장고", "NNG") in pecab.pos_batch([text])[0]
+    assert ("지펠냉장고", "NNG") in list(pecab.iter_pos(text))
+
+    pecab.update_user_dict(remove=["지펠냉장고"])
+    assert pecab.pos(text) == before
+
+
+def test_reload_userdict(pecab_with_userdict: PeCab, tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict(["삼성디지털프라자", "지펠냉장고"], path)
+    pecab = PeCab(user_dict=["지펠"])
+    pecab.reload_user_dict(path)
+    assert pecab.pos(text) == pecab_with_userdict.pos(text)
+    assert pecab.user_dict_path == path and pecab.user_dict is None
+
+
+def test_update_userdict_in_flight():
+    # an analysis that has started finishes with the dictionary it started with.
+    pecab = PeCab()
+    tokens = pecab.iter_pos(text * 200)
+    first = next(tokens)
+    thread = threading.Thread(
+        target=pecab.update_user_dict, kwargs={"add": ["지펠냉장고"]}
+    )
+    thread.start()
+    thread.join()
+    assert ("지펠냉장고", "NNG") not in [first, *tokens]
+    assert ("지펠냉장고", "NNG") in pecab.pos(text)
+
+
+def _worker_state():
+    from pecab import _async, _user_dict
+
+    return len(_async._process_pecabs), len(_user_dict._received)
+
+
+def test_update_userdict_in_workers():
+    # workers receive the current dictionary, not the history of its updates.
+    pecab = PeCab()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        pecab.set_executor(executor)
+        for i in range(Tokenization.RECEIVED_USER_DICTS + 4):
+            pecab.update_user_dict(add=[f"지펠냉장고{i}"])
+            word = f"지펠냉장고{i}"
+            assert (word, "NNG") in asyncio.run(pecab.apos(f"저는 {word}를 샀어요."))
+            assert list(pecab.pipe([text], n_process=2)) == [pecab.pos(text)]
+
+        assert executor.submit(_worker_state).result() == (
+            1,
+            Tokenization.RECEIVED_USER_DICTS,
+        )
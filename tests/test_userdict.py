@@ -16,3 +16,13 @@ label = [
 
 def test_userdict(pecab_with_userdict: PeCab):
     assert pecab_with_userdict.pos("저는 삼성디지털프라자에서 지펠냉장고를 샀어요.") == label
+
+
+def test_userdict_longest_match():
+    pecab = PeCab(user_dict=["삼성", "삼성디지털", "삼성디지털프라자", "지펠"])
+    user_dict = pecab.tokenizer.user_dict
+    text = "삼성디지털프라자에서"
+    assert user_dict.longest_match(text, 0) == (8, user_dict["삼성디지털프라자"])
+    assert user_dict.longest_match(text, 1) is None
+    assert user_dict["삼성디지"] is None
+    assert pecab.pos(text)[0] == ("삼성디지털프라자", "NNG")
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from pecab import PeCab, compile_user_dict
+from tests import pecab_with_userdict  # noqa
+
+text = "저는 삼성디지털프라자에서 지펠냉장고를 샀어요."
+
+rows = """\
+삼성디지털프라자,1788,3549,-10000,NNP,*,F,삼성디지털프라자,Compound,*,*,삼성/NNP/*+디지털/NNG/*+프라자/NNG/*
+지펠냉장고,,,,NNG,*,F,지펠냉장고,*,*,*,*
+"""
+
+
+def write_csv(tmp_path):
+    path = os.path.join(tmp_path, "user.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(rows)
+    return path
+
+
+def test_userdict_csv(tmp_path):
+    pecab = PeCab(user_dict=write_csv(tmp_path))
+    assert pecab.pos(text)[2:5] == [
+        ("삼성디지털프라자", "NNP"),
+        ("에서", "JKB"),
+        ("지펠냉장고", "NNG"),
+    ]
+
+
+def test_userdict_csv_defaults(pecab_with_userdict: PeCab, tmp_path):
+    # rows without ids and cost are registered like the words of a list.
+    user_dicts = [
+        PeCab(user_dict=write_csv(tmp_path)).tokenizer.user_dict,
+        pecab_with_userdict.tokenizer.user_dict,
+    ]
+    entries = [
+        [
+            user_dict.entries.get_entry(row)
+            for row in user_dict.entries.get_rows(user_dict["지펠냉장고"])
+        ]
+        for user_dict in user_dicts
+    ]
+    assert entries[0] == entries[1]
+
+
+def test_userdict_csv_split_compound(tmp_path):
+    pecab = PeCab(user_dict=write_csv(tmp_path), split_compound=True)
+    assert pecab.morphs(text)[2:5] == ["삼성", "디지털", "프라자"]
+
+
+def test_userdict_csv_compiled(tmp_path):
+    path = os.path.join(tmp_path, "user_dict")
+    compile_user_dict(write_csv(tmp_path), path)
+    expected = PeCab(user_dict=write_csv(tmp_path))
+    assert PeCab(user_dict_path=path).pos(text) == expected.pos(text)
+
+
+def test_userdict_csv_space(tmp_path):
+    path = os.path.join(tmp_path, "user.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("영치기 영차,,,,NNG,*,F,영치기 영차,*,*,*,*\n")
+    with pytest.raises(ValueError):
+        PeCab(user_dict=path)